@@ -0,0 +1,170 @@
+"""
+ASCII Map Library for compiling and caching image ascii maps
+"""
+
+# Imports
+import json
+import math
+import hashlib
+import numpy as np
+
+# Main Vars
+ASCII_MAP_VALUES = 256
+
+# Util Vars
+COMPILED_ASCII_MAPS = {}
+
+# Utils Functions
+def ASCIIMap_Hash(mapData):
+    '''
+    ASCII Map - Content hash of map data
+    '''
+    mapBytes = json.dumps(mapData, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(mapBytes).hexdigest()
+
+def ASCIIMap_LookupTable(mapData):
+    '''
+    ASCII Map - Compile map into a 256 entry character code lookup table
+    '''
+    # Later map entries override earlier ones, values outside all ranges use the default fill
+    LookupTable = np.full(ASCII_MAP_VALUES, ord(mapData["default"]["fillStr"]), dtype=np.uint32)
+    for fillVals in mapData["map"]:
+        valRange = ASCIIMap_ValueRange(fillVals["valRange"])
+        LookupTable[valRange[0]:valRange[1]] = ord(fillVals["fillStr"])
+    # Use single byte codes when all characters fit in a byte (latin-1)
+    if LookupTable.max() < 256:
+        LookupTable = LookupTable.astype(np.uint8)
+    return LookupTable
+
+def ASCIIMap_LevelTable(LookupTable):
+    '''
+    ASCII Map - Representative value (middle of its run of equal characters) of each of the 256 values
+    '''
+    runStarts = np.concatenate([[0], np.flatnonzero(np.diff(LookupTable.astype(np.int64))) + 1])
+    runEnds = np.concatenate([runStarts[1:], [LookupTable.shape[0]]])
+    runLevels = (runStarts + runEnds - 1) / 2.0
+    LevelTable = np.repeat(runLevels, runEnds - runStarts).astype(np.float32)
+    return LevelTable
+
+def ASCIIMap_ValueBins(mapData, dtype=np.uint8):
+    '''
+    ASCII Map - Sorted value edges and character codes of the bins between them, keeping fractional valRange edges exact
+    '''
+    # Value v (in 0 to 256 pixel value units) gets codes[searchsorted(edges, v, side="right")]
+    # Values below 0 or above 256 get the codes of the first and last bins
+    bounds = np.unique(np.clip(
+        [0.0, float(ASCII_MAP_VALUES)] + [v for fillVals in mapData["map"] for v in fillVals["valRange"]],
+        0.0, float(ASCII_MAP_VALUES)
+    ))
+    starts = bounds[:-1]
+    codes = np.full(starts.shape[0], ord(mapData["default"]["fillStr"]), dtype=np.uint32)
+    for fillVals in mapData["map"]:
+        valRange = np.clip(fillVals["valRange"], 0.0, float(ASCII_MAP_VALUES))
+        codes[(starts >= valRange[0]) & (starts < valRange[1])] = ord(fillVals["fillStr"])
+    # Merge neighbouring bins with equal codes
+    keep = np.concatenate([[True], np.diff(codes.astype(np.int64)) != 0])
+    edges = starts[keep][1:]
+    codes = codes[keep].astype(dtype)
+    return edges, codes
+
+def ASCIIMap_ValueRange(valRange):
+    '''
+    ASCII Map - Integer pixel value range [start, end) covered by a valRange
+    '''
+    return [min(ASCII_MAP_VALUES, max(0, math.ceil(v))) for v in valRange]
+
+def ASCIIMap_Validate(mapData):
+    '''
+    ASCII Map - Validate map and find gapped and overlapping value ranges
+    '''
+    # Check entries
+    fillStrs = [mapData["default"]["fillStr"]] + [fillVals["fillStr"] for fillVals in mapData["map"]]
+    for fillStr in fillStrs:
+        if len(fillStr) != 1:
+            raise ValueError("ASCII map fillStr must be a single character, got " + repr(fillStr))
+    for fillVals in mapData["map"]:
+        if not fillVals["valRange"][0] < fillVals["valRange"][1]:
+            raise ValueError("ASCII map valRange must be increasing, got " + repr(fillVals["valRange"]))
+    # Count how many entries cover each value
+    coverCounts = np.zeros(ASCII_MAP_VALUES+1, dtype=int)
+    for fillVals in mapData["map"]:
+        valRange = ASCIIMap_ValueRange(fillVals["valRange"])
+        coverCounts[valRange[0]] += 1
+        coverCounts[valRange[1]] -= 1
+    coverCounts = np.cumsum(coverCounts)[:-1]
+    gaps = ValueRanges_FromMask(coverCounts == 0)
+    overlaps = ValueRanges_FromMask(coverCounts > 1)
+    return gaps, overlaps
+
+def ValueRanges_FromMask(mask):
+    '''
+    Value Ranges - Get [start, end) ranges where mask is True
+    '''
+    edges = np.diff(np.concatenate(([0], mask.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    return [[int(s), int(e)] for s, e in zip(starts, ends)]
+
+# Main Classes
+class CompiledASCIIMap:
+    '''
+    Compiled ASCII Map - Image ASCII map with precomputed lookup table
+    '''
+    def __init__(self, mapData, mapHash=None):
+        self.name = mapData.get("name", "")
+        self.mapData = mapData
+        self.hash = ASCIIMap_Hash(mapData) if mapHash is None else mapHash
+        self.gaps, self.overlaps = ASCIIMap_Validate(mapData)
+        self.lookupTable = ASCIIMap_LookupTable(mapData)
+        self.lookupTable.flags.writeable = False
+        self.levelTable = ASCIIMap_LevelTable(self.lookupTable)
+        self.levelTable.flags.writeable = False
+        self.levelCount = len(np.unique(self.levelTable))
+        self.valueEdges, self.valueCodes = ASCIIMap_ValueBins(mapData, self.lookupTable.dtype)
+        self.valueEdges.flags.writeable = False
+        self.valueCodes.flags.writeable = False
+        self.charSet = "".join(dict.fromkeys(map(chr, self.lookupTable)))
+
+    def __getitem__(self, key):
+        return self.mapData[key]
+
+    def __repr__(self):
+        return "CompiledASCIIMap(name=" + repr(self.name) + ", hash=" + self.hash[:12] + ")"
+
+# Main Functions
+def ASCIIMap_FromChars(chars, name=""):
+    '''
+    ASCII Map - Map data splitting values evenly between chars ordered from darkest (first, used as default) to brightest
+    '''
+    edges = (np.arange(len(chars)+1) * ASCII_MAP_VALUES) // len(chars)
+    mapData = {
+        "name": name,
+        "map": [{"fillStr": c, "valRange": [int(edges[i]), int(edges[i+1])]} for i, c in enumerate(chars) if i > 0],
+        "default": {"fillStr": chars[0]}
+    }
+    return mapData
+
+def ASCIIMap_Compile(mapData, strict=False):
+    '''
+    ASCII Map - Compile map data (cached by content hash)
+    '''
+    if isinstance(mapData, CompiledASCIIMap): return mapData
+
+    mapHash = ASCIIMap_Hash(mapData)
+    if mapHash not in COMPILED_ASCII_MAPS.keys():
+        COMPILED_ASCII_MAPS[mapHash] = CompiledASCIIMap(mapData, mapHash)
+    ASCII_MAP = COMPILED_ASCII_MAPS[mapHash]
+    if strict and (len(ASCII_MAP.gaps) > 0 or len(ASCII_MAP.overlaps) > 0):
+        raise ValueError(
+            "ASCII map " + repr(ASCII_MAP.name) + " has gapped ranges " + str(ASCII_MAP.gaps)
+            + " and overlapping ranges " + str(ASCII_MAP.overlaps)
+        )
+    return ASCII_MAP
+
+def ASCIIMap_Load(path, strict=False):
+    '''
+    ASCII Map - Load and compile map from JSON file
+    '''
+    with open(path, "r", encoding="utf-8") as f:
+        mapData = json.load(f)
+    return ASCIIMap_Compile(mapData, strict=strict)
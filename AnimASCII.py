@@ -3,12 +3,26 @@ A tool for generating and viewing ASCII animations (from images, text, sound and
 """
 
 # Imports
+import os
 import functools
+import hashlib
 import json
 import art
+import numpy as np
 
+import AnimFileLibrary
+import CacheLibrary
+import ColorLibrary
+import FrameLibrary
 import GeneratorLibrary
 import PaddingLibrary
+import VideoStoreLibrary
+from Utils import ImageUtils
+
+# Main Vars
+ANIMATION_JSONL_FLUSH_FRAMES = 64
+ANIMATION_SPEC_VERSION = 1
+RANDOM_FONT_PREFIXES = ["random", "rand", "rnd"]
 
 # Utils Functions
 def Convert_ASCIIAnimList2JSONData(animList, name="Animation"):
@@ -21,67 +35,421 @@ def Convert_ASCIIAnimList2JSONData(animList, name="Animation"):
     }
     return jsonData
 
+def Animation_SaveJSON(jsonData, savePath):
+    '''
+    Animation - Save JSON Data writing one frame at a time (same output as json.dump), returns number of frames
+    '''
+    # Frames can be a lazy view or generator, each frame is only computed when written
+    # Interned frames (FrameTimeline) are saved as their unique frames and timeline instead of a "data" list
+    frames = jsonData["data"]
+    interned = isinstance(frames, FrameLibrary.FrameTimeline)
+    frameCount = 0
+    with open(savePath, "w") as f:
+        f.write("{\"name\": " + json.dumps(jsonData["name"]) + (", \"frames\": [" if interned else ", \"data\": ["))
+        for i, frame in enumerate(frames.frameTable if interned else frames):
+            if i > 0: f.write(", ")
+            f.write(json.dumps(frame))
+            frameCount += 1
+        f.write("]")
+        if interned:
+            f.write(", \"timeline\": " + json.dumps(frames.timeline))
+            frameCount = len(frames)
+        f.write("}")
+    return frameCount
+
+def Animation_SaveJSONL(name, frames, savePath, flushFrames=ANIMATION_JSONL_FLUSH_FRAMES):
+    '''
+    Animation - Save frames to a JSON Lines file as they are produced (first line is {"name": name}, then one frame per line)
+    '''
+    # Frames are flushed every flushFrames frames so that readers can consume the animation while it is written
+    frameCount = 0
+    with open(savePath, "w") as f:
+        f.write(json.dumps({"name": name}) + "\n")
+        for frame in frames:
+            f.write(json.dumps(frame) + "\n")
+            frameCount += 1
+            if frameCount % flushFrames == 0: f.flush()
+    return frameCount
+
+def Animation_IterJSONL(path):
+    '''
+    Animation - Iterate frames of a JSON Lines animation file
+    '''
+    # Only complete lines are read, so a file that is still being written gives the frames written so far
+    with open(path, "r") as f:
+        f.readline()
+        for line in f:
+            if not line.endswith("\n"): break
+            yield json.loads(line)
+
+def Animation_Save(jsonData, savePath, fileFormat=None):
+    '''
+    Animation - Save JSON Data as JSON, JSON Lines or compact anim file (by fileFormat extension, else by extension of savePath), returns number of frames
+    '''
+    ext = os.path.splitext(savePath)[-1].lower() if fileFormat is None else fileFormat.lower()
+    if ext == ".jsonl":
+        return Animation_SaveJSONL(jsonData["name"], jsonData["data"], savePath)
+    if ext == AnimFileLibrary.ANIMFILE_EXT:
+        return AnimFileLibrary.AnimFile_Save(jsonData["name"], jsonData["data"], savePath)
+    return Animation_SaveJSON(jsonData, savePath)
+
+def Animation_Load(path, lazy=False):
+    '''
+    Animation - Load JSON, JSON Lines, compact anim or ascii video store file
+    '''
+    # If lazy, frames of JSON Lines files are a generator reading the file as frames are used
+    # Frames of anim and video store files are always a random access sequence decoding frames when read
+    if os.path.splitext(path)[-1].lower() == AnimFileLibrary.ANIMFILE_EXT:
+        return AnimFileLibrary.AnimFile_Load(path)
+    if os.path.splitext(path)[-1].lower() == VideoStoreLibrary.VIDEOSTORE_EXT:
+        return VideoStoreLibrary.VideoStore_Load(path)
+    if os.path.splitext(path)[-1].lower() == ".jsonl":
+        with open(path, "r") as f:
+            header = json.loads(f.readline())
+        frames = Animation_IterJSONL(path)
+        return Convert_ASCIIAnimList2JSONData(frames if lazy else list(frames), header["name"])
+    with open(path, "r") as f:
+        jsonData = json.load(f)
+    if "timeline" in jsonData.keys():
+        frames = FrameLibrary.FrameTimeline(jsonData["frames"], jsonData["timeline"])
+        return Convert_ASCIIAnimList2JSONData(frames, jsonData["name"])
+    return jsonData
+
+def Font_IsRandom(font):
+    '''
+    Font - Check if font picks a random font on each use (like "random" or "rnd-small")
+    '''
+    return font.lower().split("-")[0] in RANDOM_FONT_PREFIXES
+
+def AnimationData_CacheKey(data, GenertorFunc):
+    '''
+    Animation Data - Cache key of animation data and generator function, or None if its frames are random or cannot be hashed
+    '''
+    # Text art with a random font and simulations without a seed give different frames on each run
+    for func in data.get("preProcessFuncs", []):
+        isPartial = isinstance(func, functools.partial)
+        if (func.func if isPartial else func) is Convert_Text2ASCIIArt:
+            if Font_IsRandom(func.keywords.get("font", "random") if isPartial else "random"): return None
+    if GenertorFunc in ANIMATION_STAGES_SIMULATION and data.get("seed", None) is None:
+        return None
+    try:
+        return CacheLibrary.Cache_Key("Animation_Generate_Basic", data, GenertorFunc)
+    except TypeError:
+        return None
+
 # Conversion Functions
-def Convert_Text2ASCIIArt(text, font="random"):
+def Convert_Text2ASCIIArt(text, font="random", cache=None):
     '''
     Convert - Text to ASCII Art
     '''
+    # If cache (a CacheLibrary.ResultCache) is given, results of fixed fonts are cached
+    if cache is not None and not Font_IsRandom(font):
+        key = ("Convert_Text2ASCIIArt", text, font, art.__version__)
+        return cache.Call(key, functools.partial(Convert_Text2ASCIIArt, text, font))
     asciiArt = art.text2art(text, font=font, chr_ignore=True)
     return asciiArt
 
-def Convert_Image2ASCIIArt(I, processFunc=None):
+def Convert_Image2ASCIIArt(I, processFunc=None, cache=None):
     '''
     Convert - Image to ASCII Art
     '''
+    # If cache is given, results are cached by image content and processFunc (with all its params)
+    if cache is not None:
+        try:
+            key = CacheLibrary.Cache_Key("Convert_Image2ASCIIArt", I, processFunc)
+        except TypeError:
+            key = None
+        if key is not None:
+            return cache.Call((key,), functools.partial(Convert_Image2ASCIIArt, I, processFunc))
     asciiArt, finalImg = processFunc(I)
     return asciiArt, finalImg
 
-# Main Functions
-def Animation_Generate_Basic(data, savePath, GenertorFunc=GeneratorLibrary.GenerateAnimation_TextBased_BuildUpText):
+def Convert_Images2ASCIIArt(Is, processFunc=None):
     '''
-    Animation - Generate - Basic
+    Convert - Batch of Images (N, H, W) or (N, H, W, 3) to list of ASCII Arts
+    '''
+    asciiArts, finalImgs = processFunc(Is, batch=True)
+    return asciiArts, finalImgs
+
+def Convert_Image2ASCIIBuffer(I, renderFunc=None, buffer=None, batch=False, hStretch=1):
+    '''
+    Convert - Image (or batch of images) to ASCII Character Buffer (reuses given buffer if any)
+    '''
+    # hStretch repeats each character along rows, to display characters with a wider aspect without padding spaces
+    if hStretch == 1:
+        buffer, finalImg = renderFunc(I, buffer=buffer, batch=batch)
+    else:
+        cellBuffer, finalImg = renderFunc(I, batch=batch)
+        buffer = GeneratorLibrary.ASCIIBuffer_StretchX(cellBuffer, hStretch, buffer)
+    return buffer, finalImg
+
+def Convert_Image2ANSIArt(I, renderFunc=None, colorMode="256", colorBits=8, batch=False, valueRange=None):
+    '''
+    Convert - Image (or batch of images) to ANSI colored ASCII Art
+    '''
+    # I must be RGB (uint8, uint16 or float), each character is colored with the mean color of its cell
+    # If valueRange is given, it is used for both the characters and the colors
+    if valueRange is None:
+        buffer, finalImg = renderFunc(I, batch=batch)
+    else:
+        buffer, finalImg = renderFunc(I, batch=batch, valueRange=valueRange)
+    I_cells = ColorLibrary.ColorCells_FromImage(I, buffer.shape[:-1] + (buffer.shape[-1]-1,), valueRange)
+    colorIDs = ColorLibrary.ColorIDs_Quantize(I_cells, colorMode, colorBits)
+    if batch:
+        ansiArt = [ColorLibrary.ANSIColor_Render(buffer[i], colorIDs[i], colorMode) for i in range(buffer.shape[0])]
+    else:
+        ansiArt = ColorLibrary.ANSIColor_Render(buffer, colorIDs, colorMode)
+    return ansiArt, finalImg
+
+def Convert_ImageFile2ASCIIArt_Tiled(
+    imgPath, outFile, renderFunc=None, asciiWidth=128,
+    charAspect=ImageUtils.CHAR_ASPECT_RATIO, cellSize=(1, 1), bandBytes=ImageUtils.TILED_BAND_BYTES,
+    rawShape=None, rawDtype=np.uint8
+    ):
+    '''
+    Convert - Large Image File to ASCII Art written band by band to a file path or text stream
+    '''
+    # .npy and raw (rawShape given) inputs are memory mapped, so only one band of source rows is read at a time
+    # renderFunc renders a block of cells (cellSize pixels per character) into a character buffer
+    # Border styles see each band separately, so edges exactly on band seams can differ from whole image output
+    I = ImageUtils.ImageSource_Open(imgPath, rawShape, rawDtype)
+    imgSize = I.shape[:2]
+    cols = min(imgSize[1] // cellSize[1], max(1, int(asciiWidth)))
+    rows = max(1, min(imgSize[0] // cellSize[0], ImageUtils.CellCount_Rows(imgSize, cols, charAspect)))
+    rowEdges = ImageUtils.CellEdges(imgSize[0], rows * cellSize[0])
+    colEdges = ImageUtils.CellEdges(imgSize[1], cols * cellSize[1])
+    rowBytes = I.strides[0] if I.flags.c_contiguous else int(np.prod(I.shape[1:])) * I.dtype.itemsize
+    bands = ImageUtils.CellRows_Bands(rowEdges[::cellSize[0]], rowBytes, bandBytes)
+
+    f = open(outFile, "w", encoding="utf-8") if isinstance(outFile, str) else outFile
+    try:
+        buffer = None
+        for i, (start, end) in enumerate(bands):
+            bandEdges = rowEdges[start*cellSize[0]:end*cellSize[0]+1]
+            I_band = ImageUtils.ResizeImage_CellEdges(I, bandEdges, colEdges)
+            ImageUtils.ImageSource_Release(I)
+            # Reuse the buffer for all bands of equal height
+            if buffer is not None and buffer.shape[0] != end - start: buffer = None
+            buffer, _ = renderFunc(I_band, buffer=buffer)
+            if i > 0: f.write("\n")
+            f.write(GeneratorLibrary.ASCIIBuffer_ToStr(buffer))
+    finally:
+        if isinstance(outFile, str): f.close()
+    return rows, cols
+
+def Animation_PreProcess(data):
+    '''
+    Animation - Apply pre process functions to text of animation data
     '''
-    # Preprocess Data
     if "preProcessFuncs" in data.keys():
         text = data["text"]
         for func in data["preProcessFuncs"]:
             text = func(text)
         data["text"] = text
+    return data
+
+def AnimationSpec_Hash(spec):
+    '''
+    Animation Spec - Content hash of spec (same for equal specs regardless of key order)
+    '''
+    specBytes = json.dumps(
+        {"version": ANIMATION_SPEC_VERSION, "spec": spec},
+        sort_keys=True, separators=(",", ":"), ensure_ascii=False
+    ).encode("utf-8")
+    return hashlib.sha256(specBytes).hexdigest()
+
+def AnimationSpec_Stage(kind, stageSpec):
+    '''
+    Animation Spec - Registered function and params of a stage spec {"stage": name, "params": {...}} of given kind
+    '''
+    if stageSpec["stage"] not in ANIMATION_STAGES[kind].keys():
+        raise ValueError(
+            "Unknown " + kind + " stage " + repr(stageSpec["stage"])
+            + ", expected one of " + str(list(ANIMATION_STAGES[kind].keys()))
+        )
+    return ANIMATION_STAGES[kind][stageSpec["stage"]], dict(stageSpec.get("params", {}))
+
+def AnimationSpec_Resolve(spec):
+    '''
+    Animation Spec - Resolve spec into animation data with process functions and the generator function
+    '''
+    # Spec must be JSON serializable, so it can be hashed, saved and sent to other processes as it is
+    json.dumps(spec)
+    GeneratorFunc, generatorParams = AnimationSpec_Stage("generators", spec["generator"])
+    data = dict(generatorParams)
+    data["name"] = spec["name"]
+    data["text"] = spec.get("text", "")
+    data["preProcessFuncs"] = []
+    for stageSpec in spec.get("preProcess", []):
+        func, params = AnimationSpec_Stage("preProcess", stageSpec)
+        data["preProcessFuncs"].append(functools.partial(func, **params))
+    data["postProcessFuncs"] = []
+    for stageSpec in spec.get("postProcess", []):
+        func, params = AnimationSpec_Stage("postProcess", stageSpec)
+        data["postProcessFuncs"].append(functools.partial(func, **params))
+    return data, GeneratorFunc
+
+def AnimationSpec_FromStageFunc(kind, func):
+    '''
+    Animation Spec - Stage spec of a registered function or a functools.partial of one (with only keyword args)
+    '''
+    params = {}
+    if isinstance(func, functools.partial):
+        if len(func.args) > 0:
+            raise ValueError("Stage partial of " + repr(func.func) + " has positional args, only keyword args can be in a spec")
+        func, params = func.func, dict(func.keywords)
+    for name, stageFunc in ANIMATION_STAGES[kind].items():
+        if stageFunc is func:
+            return {"stage": name, "params": params}
+    raise ValueError("Function " + repr(func) + " is not a registered " + kind + " stage")
+
+def AnimationSpec_FromData(data, GenertorFunc=GeneratorLibrary.GenerateAnimation_TextBased_BuildUpText):
+    '''
+    Animation Spec - Spec of animation data with process functions and the generator function (all must be registered stages)
+    '''
+    funcKeys = ["name", "text", "preProcessFuncs", "postProcessFuncs"]
+    generatorSpec = AnimationSpec_FromStageFunc("generators", GenertorFunc)
+    generatorSpec["params"] = {k: v for k, v in data.items() if k not in funcKeys}
+    spec = {
+        "name": data["name"],
+        "text": data.get("text", ""),
+        "generator": generatorSpec,
+        "preProcess": [AnimationSpec_FromStageFunc("preProcess", func) for func in data.get("preProcessFuncs", [])],
+        "postProcess": [AnimationSpec_FromStageFunc("postProcess", func) for func in data.get("postProcessFuncs", [])]
+    }
+    return spec
+
+# Stage Registry Vars
+# Stages that animation specs can refer to by name
+ANIMATION_STAGES = {
+    "generators": {
+        "BuildUpText": GeneratorLibrary.GenerateAnimation_TextBased_BuildUpText,
+        "Marquee": GeneratorLibrary.GenerateAnimation_TextBased_Marquee,
+        "Typewriter": GeneratorLibrary.GenerateAnimation_TextBased_Typewriter,
+        "Wipe": GeneratorLibrary.GenerateAnimation_TextBased_Wipe,
+        "DensityFade": GeneratorLibrary.GenerateAnimation_TextBased_DensityFade,
+        "ColumnWave": GeneratorLibrary.GenerateAnimation_TextBased_ColumnWave,
+        "MatrixRain": GeneratorLibrary.GenerateAnimation_SimulationBased_MatrixRain,
+        "Starfield": GeneratorLibrary.GenerateAnimation_SimulationBased_Starfield,
+        "Fire": GeneratorLibrary.GenerateAnimation_SimulationBased_Fire
+    },
+    "preProcess": {
+        "Text2ASCIIArt": Convert_Text2ASCIIArt
+    },
+    "postProcess": {
+        "SimpleStrRepeat": PaddingLibrary.Padding_SimpleStrRepeat,
+        "FramePad": PaddingLibrary.Padding_FramePad
+    }
+}
 
-    # Get Generated List
-    animList = GenertorFunc(data)
+# Post process stages that pad each frame independently, so they can run lazily
+FrameLibrary.PERFRAME_LIST_FUNCS.update([PaddingLibrary.Padding_SimpleStrRepeat, PaddingLibrary.Padding_FramePad])
 
-    # Postprocess Data
-    if "postProcessFuncs" in data.keys():
-        for func in data["postProcessFuncs"]:
-            animList = func(animList)
+# Generators that give random frames unless data["seed"] is given
+ANIMATION_STAGES_SIMULATION = [
+    GeneratorLibrary.GenerateAnimation_SimulationBased_MatrixRain,
+    GeneratorLibrary.GenerateAnimation_SimulationBased_Starfield,
+    GeneratorLibrary.GenerateAnimation_SimulationBased_Fire
+]
+
+# Main Functions
+def Animation_Generate_Basic(data, savePath, GenertorFunc=GeneratorLibrary.GenerateAnimation_TextBased_BuildUpText, lazy=True, intern=False, cache=None, fileFormat=None):
+    '''
+    Animation - Generate - Basic
+    '''
+    # If lazy, per frame post processing (like padding) is done frame by frame while saving and returned data is a lazy view of the frames
+    # Other post processing functions always get the whole list of frames
+    # If intern, frames are interned into a timeline (JSON files then store each unique frame once)
+    # If cache is given, frames are cached by data (text, params and process functions) and generator, the file is always saved
+    # File format is fileFormat (an extension) or picked by extension of savePath (see Animation_Save)
+    cacheKey = None if cache is None else AnimationData_CacheKey(data, GenertorFunc)
+    animList = None if cacheKey is None else cache.Get(cacheKey)
+    if animList is None:
+        # Preprocess Data
+        Animation_PreProcess(data)
+
+        # Get Generated List
+        # Generators that yield frames are collected, as the returned data must still hold the frames after saving
+        animList = GenertorFunc(data)
+        if not FrameLibrary.Frames_IsSequence(animList): animList = list(animList)
+
+        # Postprocess Data
+        if "postProcessFuncs" in data.keys():
+            animList = FrameLibrary.Frames_PostProcess(animList, data["postProcessFuncs"], lazy)
+        if cacheKey is not None:
+            animList = list(animList)
+            cache.Put(cacheKey, animList)
+    if intern:
+        animList = FrameLibrary.Frames_Intern(animList)
 
     # Convert to JSON data
     jsonData = Convert_ASCIIAnimList2JSONData(animList, data["name"])
 
     # Save JSON
-    json.dump(jsonData, open(savePath, "w"))
+    Animation_Save(jsonData, savePath, fileFormat)
 
     return jsonData
 
+def Animation_Generate_Stream(data, savePath, GenertorFunc=GeneratorLibrary.GenerateAnimation_TextBased_BuildUpText, cache=None, fileFormat=None):
+    '''
+    Animation - Generate - Stream frames from generator through post processing into a JSON Lines (or other format) file
+    '''
+    # Frames are chained as iterators, so memory does not grow with animation length if GenertorFunc yields frames
+    # File format is fileFormat (an extension) or picked by extension of savePath (see Animation_Save)
+    # If cache is given, frames are also collected for the cache while they are written
+    cacheKey = None if cache is None else AnimationData_CacheKey(data, GenertorFunc)
+    frames = None if cacheKey is None else cache.Get(cacheKey)
+    cacheFrames = None
+    if frames is None:
+        # Preprocess Data
+        Animation_PreProcess(data)
+
+        # Get Generated Frames
+        frames = iter(GenertorFunc(data))
+
+        # Postprocess Data
+        if "postProcessFuncs" in data.keys():
+            frames = FrameLibrary.Frames_PostProcess(frames, data["postProcessFuncs"], lazy=True)
+        if cacheKey is not None:
+            cacheFrames = []
+            frames = FrameLibrary.Frames_Collect(frames, cacheFrames)
+
+    # Save
+    frameCount = Animation_Save(Convert_ASCIIAnimList2JSONData(frames, data["name"]), savePath, fileFormat)
+    if cacheFrames is not None:
+        cache.Put(cacheKey, cacheFrames)
+
+    return frameCount
+
+def Animation_Generate_Spec(spec, savePath, lazy=True, stream=False, cache=None, fileFormat=None):
+    '''
+    Animation - Generate - From a declarative spec of registered stages
+    '''
+    # Spec => {"name", "text", "generator": {"stage", "params"}, "preProcess": [{"stage", "params"}, ...], "postProcess": [...]}
+    # If stream, frames are streamed into the file and the frame count is returned (else the JSON data)
+    data, GeneratorFunc = AnimationSpec_Resolve(spec)
+    if stream:
+        return Animation_Generate_Stream(data, savePath, GeneratorFunc, cache, fileFormat)
+    return Animation_Generate_Basic(data, savePath, GeneratorFunc, lazy, cache=cache, fileFormat=fileFormat)
+
 # # Run Code
 # # Params
 # animName = "Loading_3"
 # savePath = "Data/Examples/" + animName + ".json"
 
-# GeneratorFunc = GeneratorLibrary.GenerateAnimation_TextBased_BuildUpText
-# inputData = {
+# animSpec = {
 #     "name": animName,
 #     "text": 
 # '''ASCII Animator''',
-#     "preProcessFuncs": [
-#         functools.partial(Convert_Text2ASCIIArt, font="random")
+#     "generator": {"stage": "BuildUpText", "params": {}},
+#     "preProcess": [
+#         {"stage": "Text2ASCIIArt", "params": {"font": "random"}}
 #     ],
-#     "postProcessFuncs": [
-#         functools.partial(PaddingLibrary.Padding_SimpleStrRepeat, padStr="o", X_count=1, Y_count=1)
+#     "postProcess": [
+#         {"stage": "SimpleStrRepeat", "params": {"padStr": "o", "X_count": 1, "Y_count": 1}}
 #     ]
 # }
 # # Params
 
 # # RunCode
-# Animation_Generate_Basic(inputData, savePath, GeneratorFunc)
\ No newline at end of file
+# Animation_Generate_Spec(animSpec, savePath)
\ No newline at end of file
@@ -0,0 +1,198 @@
+"""
+Anim File Library for compact delta encoded and compressed ascii animation files
+"""
+
+# Imports
+import json
+import zlib
+import struct
+import numpy as np
+
+# Main Vars
+ANIMFILE_EXT = ".anim"
+ANIMFILE_MAGIC = b"ASCIIANM"
+ANIMFILE_VERSION = 1
+ANIMFILE_BLOCK_FRAMES = 16
+ANIMFILE_KEYFRAME_CHANGE = 0.5
+ANIMFILE_COMPRESS_LEVEL = 9
+
+# Util Vars
+ANIMFILE_RECORD_KEYFRAME = 0
+ANIMFILE_RECORD_DELTA = 1
+
+# Utils Functions
+def Deflate(data):
+    '''
+    Deflate - Raw deflate compress bytes (no zlib header and checksum)
+    '''
+    compressor = zlib.compressobj(ANIMFILE_COMPRESS_LEVEL, zlib.DEFLATED, -15)
+    return compressor.compress(data) + compressor.flush()
+
+def Inflate(data):
+    '''
+    Inflate - Decompress raw deflate bytes
+    '''
+    return zlib.decompress(data, -15)
+
+def Frame_Codes(frame):
+    '''
+    Frame - Character codes of frame text
+    '''
+    return np.frombuffer(frame.encode("utf-32-le"), dtype="<u4")
+
+def Codes_Frame(codes):
+    '''
+    Frame - Frame text of character codes
+    '''
+    return codes.astype("<u4", copy=False).tobytes().decode("utf-32-le")
+
+def Record_Keyframe(frame):
+    '''
+    Record - Encode keyframe record of full frame text
+    '''
+    payload = frame.encode("utf-8")
+    return struct.pack("<BI", ANIMFILE_RECORD_KEYFRAME, len(payload)) + payload
+
+def Record_Delta(prevCodes, codes):
+    '''
+    Record - Encode delta record of changed character runs from previous frame codes, or None if a keyframe is better
+    '''
+    # Delta payload is run count, run starts, run lengths (uint32) and the utf-8 text of all changed characters
+    if codes.shape != prevCodes.shape: return None
+    changed = codes != prevCodes
+    if np.count_nonzero(changed) > ANIMFILE_KEYFRAME_CHANGE * codes.shape[0]: return None
+    edges = np.diff(np.concatenate(([0], changed.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    payload = b"".join([
+        struct.pack("<I", starts.shape[0]),
+        starts.astype("<u4").tobytes(),
+        (ends - starts).astype("<u4").tobytes(),
+        Codes_Frame(codes[changed]).encode("utf-8")
+    ])
+    return struct.pack("<BI", ANIMFILE_RECORD_DELTA, len(payload)) + payload
+
+def Record_Decode(recordType, payload, prevCodes=None):
+    '''
+    Record - Decode record payload (deltas are applied to previous frame codes) into frame codes
+    '''
+    if recordType == ANIMFILE_RECORD_KEYFRAME:
+        return Frame_Codes(payload.decode("utf-8"))
+    runCount = struct.unpack_from("<I", payload)[0]
+    runs = np.frombuffer(payload, dtype="<u4", count=2*runCount, offset=4).reshape(2, runCount).astype(np.int64)
+    changedCodes = Frame_Codes(payload[4+8*runCount:].decode("utf-8"))
+    # Positions of all changed characters from run starts and lengths
+    runOffsets = np.repeat(runs[0] - (np.cumsum(runs[1]) - runs[1]), runs[1])
+    codes = prevCodes.copy()
+    codes[runOffsets + np.arange(changedCodes.shape[0])] = changedCodes
+    return codes
+
+def Block_Write(f, records):
+    '''
+    Block - Compress records into a block and write it to file, returns size of written block
+    '''
+    blockData = Deflate(b"".join(records))
+    f.write(blockData)
+    return len(blockData)
+
+def Block_Decode(blockData):
+    '''
+    Block - Decode all frames of a compressed block of records
+    '''
+    data = Inflate(blockData)
+    frames = []
+    codes = None
+    offset = 0
+    while offset < len(data):
+        recordType, length = struct.unpack_from("<BI", data, offset)
+        offset += 5
+        codes = Record_Decode(recordType, data[offset:offset+length], codes)
+        offset += length
+        frames.append(Codes_Frame(codes))
+    return frames
+
+# Main Classes
+class AnimFile:
+    '''
+    Anim File - Random access frame sequence of a delta encoded animation file
+    '''
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self.data = f.read()
+        if not self.data.startswith(ANIMFILE_MAGIC):
+            raise ValueError("Not an ascii animation file " + repr(path))
+        headerLen = struct.unpack_from("<I", self.data, len(ANIMFILE_MAGIC))[0]
+        headerStart = len(ANIMFILE_MAGIC) + 4
+        self.header = json.loads(self.data[headerStart:headerStart+headerLen].decode("utf-8"))
+        self.name = self.header["name"]
+        self.blockFrames = self.header["blockFrames"]
+        indexOffset, self.frameCount = struct.unpack_from("<QQ", self.data, len(self.data) - 16)
+        blockCount = -(-self.frameCount // self.blockFrames)
+        self.blockOffsets = np.frombuffer(self.data, dtype="<u8", count=blockCount+1, offset=indexOffset)
+        # Last decoded block is kept, so playing frames in order decodes each block once
+        self.blockCache = (None, None)
+
+    def Block(self, b):
+        '''
+        Anim File - Decoded frames of block b
+        '''
+        if self.blockCache[0] != b:
+            blockData = self.data[int(self.blockOffsets[b]):int(self.blockOffsets[b+1])]
+            self.blockCache = (b, Block_Decode(blockData))
+        return self.blockCache[1]
+
+    def __len__(self):
+        return self.frameCount
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0: i += len(self)
+        if not 0 <= i < len(self): raise IndexError("Frame index out of range")
+        return self.Block(i // self.blockFrames)[i % self.blockFrames]
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    def __repr__(self):
+        return "AnimFile(name=" + repr(self.name) + ", frames=" + str(len(self)) + ")"
+
+# Main Functions
+def AnimFile_Save(name, frames, path, blockFrames=ANIMFILE_BLOCK_FRAMES):
+    '''
+    Anim File - Save frames as compressed blocks of keyframes and deltas, with a block offset index at the end
+    '''
+    # Each block starts with a keyframe, so any frame decodes from one block of at most blockFrames records
+    # Inside a block, frames are deltas from the previous frame unless the size or more than ANIMFILE_KEYFRAME_CHANGE of it changes
+    header = json.dumps({"name": name, "version": ANIMFILE_VERSION, "blockFrames": blockFrames}).encode("utf-8")
+    blockOffsets = []
+    frameCount = 0
+    with open(path, "wb") as f:
+        f.write(ANIMFILE_MAGIC + struct.pack("<I", len(header)) + header)
+        offset = len(ANIMFILE_MAGIC) + 4 + len(header)
+        records = []
+        prevCodes = None
+        for frame in frames:
+            codes = Frame_Codes(frame)
+            record = None if len(records) == 0 else Record_Delta(prevCodes, codes)
+            records.append(Record_Keyframe(frame) if record is None else record)
+            prevCodes = codes
+            frameCount += 1
+            if len(records) == blockFrames:
+                blockOffsets.append(offset)
+                offset += Block_Write(f, records)
+                records = []
+        if len(records) > 0:
+            blockOffsets.append(offset)
+            offset += Block_Write(f, records)
+        blockOffsets.append(offset)
+        f.write(np.array(blockOffsets, dtype="<u8").tobytes())
+        f.write(struct.pack("<QQ", offset, frameCount))
+    return frameCount
+
+def AnimFile_Load(path):
+    '''
+    Anim File - Load animation file as JSON data with a random access frame sequence
+    '''
+    animFile = AnimFile(path)
+    return {"name": animFile.name, "data": animFile}
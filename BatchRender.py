@@ -0,0 +1,230 @@
+"""
+Batch renderer for animation specs using a pool of warmed worker processes
+"""
+
+# Imports
+import os
+import sys
+import json
+import time
+import uuid
+import argparse
+import concurrent.futures
+
+import AnimASCII
+import AnimFileLibrary
+import ASCIIMapLibrary
+import CacheLibrary
+import GeneratorLibrary
+
+# Main Vars
+BATCH_OUTPUT_FORMATS = [".json", ".jsonl", AnimFileLibrary.ANIMFILE_EXT]
+BATCH_OUTPUT_DIR = "Data/Examples/"
+BATCH_MAPS_DIR = "Data/ImageASCIIData/"
+BATCH_PARTIAL_EXT = ".partial"
+BATCH_PARTIAL_STALE_SECONDS = 24*60*60
+
+# Util Vars
+WORKER_CACHE = None
+
+# Utils Functions
+def Specs_Load(path):
+    '''
+    Specs - Load animation specs from a directory of spec JSON files or a manifest JSON file (list of specs or {"jobs": [...]})
+    '''
+    if os.path.isdir(path):
+        specs = []
+        for f in sorted(os.listdir(path)):
+            if not f.lower().endswith(".json"): continue
+            with open(os.path.join(path, f), "r", encoding="utf-8") as specFile:
+                specs.append(json.load(specFile))
+        return specs
+    with open(path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    return manifest["jobs"] if isinstance(manifest, dict) else manifest
+
+def Specs_Fonts(specs):
+    '''
+    Specs - Fixed (not random) fonts used by text art stages of specs
+    '''
+    fonts = set()
+    for spec in specs:
+        for stageSpec in spec.get("preProcess", []):
+            font = stageSpec.get("params", {}).get("font", "random")
+            if stageSpec["stage"] == "Text2ASCIIArt" and not AnimASCII.Font_IsRandom(font):
+                fonts.add(font)
+    return sorted(fonts)
+
+def Spec_OutputPath(spec, outDir, outFormat):
+    '''
+    Spec - Output path of spec in outDir (raises ValueError if spec name is not a plain file name)
+    '''
+    # Names with path separators or parent references could write outside outDir
+    name = spec.get("name", None) if isinstance(spec, dict) else None
+    if not isinstance(name, str) or name.strip() in ["", ".", ".."] or os.path.basename(name) != name or "/" in name or "\\" in name:
+        raise ValueError("Spec name " + repr(name) + " is not a plain file name")
+    return os.path.join(outDir, name + outFormat)
+
+def Output_TempPath(outPath):
+    '''
+    Output - Hidden temporary path next to output path, unique to this render and process
+    '''
+    # Temporary files end with BATCH_PARTIAL_EXT (not a loadable animation extension), so loaders never list unfinished files
+    outDir, outName = os.path.split(outPath)
+    return os.path.join(outDir, "." + outName + "." + str(os.getpid()) + "." + uuid.uuid4().hex + BATCH_PARTIAL_EXT)
+
+def Process_Alive(pid):
+    '''
+    Process - Check if process with pid is running (None if it cannot be checked on this OS)
+    '''
+    if os.name != "posix": return None
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    # Killed processes stay zombies until reaped, which still accept signals
+    try:
+        with open("/proc/" + str(pid) + "/stat", "r") as f:
+            return f.read().rsplit(")", 1)[-1].split()[0] != "Z"
+    except (OSError, IndexError):
+        return True
+
+def Output_RemoveStale(outDir, log=print):
+    '''
+    Output - Remove temporary files left in outDir by killed renders
+    '''
+    # Files of renders still running (in this or another batch) are kept
+    # If process state cannot be checked, only files not modified for BATCH_PARTIAL_STALE_SECONDS are removed
+    for f in os.listdir(outDir):
+        if not (f.startswith(".") and f.endswith(BATCH_PARTIAL_EXT)): continue
+        path = os.path.join(outDir, f)
+        parts = f.split(".")
+        alive = Process_Alive(int(parts[-3])) if len(parts) >= 4 and parts[-3].isdigit() else None
+        if alive is None:
+            alive = time.time() - os.path.getmtime(path) < BATCH_PARTIAL_STALE_SECONDS
+        if not alive:
+            try:
+                os.remove(path)
+                log("CLEAN  " + path)
+            except OSError:
+                pass
+
+def Worker_Init(fonts, mapsDir, cachePath, cacheBytes):
+    '''
+    Worker - Warm up worker process by preloading fonts and compiled ascii maps and opening the result cache
+    '''
+    global WORKER_CACHE
+    for font in fonts:
+        # Unknown fonts only fail the jobs using them (a failing initializer would break the whole pool)
+        try:
+            AnimASCII.Convert_Text2ASCIIArt("A", font)
+        except Exception:
+            pass
+    if os.path.isdir(mapsDir):
+        for f in sorted(os.listdir(mapsDir)):
+            if f.endswith(".json"): ASCIIMapLibrary.ASCIIMap_Load(os.path.join(mapsDir, f))
+    ASCIIMapLibrary.ASCIIMap_Compile(GeneratorLibrary.SIMULATION_ASCII_MAP)
+    WORKER_CACHE = None if cachePath is None else CacheLibrary.ResultCache(cachePath, cacheBytes)
+
+def Worker_Render(spec, outPath):
+    '''
+    Worker - Render spec into output path, returns frame count and render time (seconds)
+    '''
+    # Frames are written to a temporary file that is then renamed, so output path only ever holds complete files
+    tempPath = Output_TempPath(outPath)
+    startTime = time.perf_counter()
+    try:
+        fileFormat = os.path.splitext(outPath)[-1]
+        frameCount = AnimASCII.Animation_Generate_Spec(spec, tempPath, stream=True, cache=WORKER_CACHE, fileFormat=fileFormat)
+        os.replace(tempPath, outPath)
+    finally:
+        if os.path.exists(tempPath): os.remove(tempPath)
+    return frameCount, time.perf_counter() - startTime
+
+# Main Functions
+def BatchRender(
+        specs, outDir=BATCH_OUTPUT_DIR, outFormat=".json", workers=None, force=False,
+        cachePath=None, cacheBytes=CacheLibrary.CACHE_MAX_BYTES, mapsDir=BATCH_MAPS_DIR, log=print
+    ):
+    '''
+    Batch Render - Render specs into outDir (one file named after each spec) across a process pool
+    '''
+    # Specs with an existing output are skipped unless force, so an interrupted batch resumes where it stopped
+    # Invalid specs (bad name, duplicate name or unknown stages) are reported as failed and the others still render
+    if outFormat not in BATCH_OUTPUT_FORMATS:
+        raise ValueError("Unknown output format " + repr(outFormat) + ", expected one of " + str(BATCH_OUTPUT_FORMATS))
+    os.makedirs(outDir, exist_ok=True)
+    Output_RemoveStale(outDir, log)
+    jobs = []
+    results = []
+    skipCount = 0
+    outPaths = set()
+    for i, spec in enumerate(specs):
+        # Specs are checked before any worker starts
+        name = spec.get("name", "#" + str(i)) if isinstance(spec, dict) else "#" + str(i)
+        try:
+            outPath = Spec_OutputPath(spec, outDir, outFormat)
+            if outPath in outPaths:
+                raise ValueError("Duplicate spec name " + repr(name))
+            outPaths.add(outPath)
+            AnimASCII.AnimationSpec_Resolve(spec)
+        except Exception as e:
+            log("FAILED " + str(name) + ": " + type(e).__name__ + ": " + str(e))
+            results.append({"name": name, "path": None, "ok": False, "error": str(e)})
+            continue
+        if os.path.exists(outPath) and not force:
+            log("SKIP   " + name + " (" + outPath + " exists)")
+            skipCount += 1
+            continue
+        jobs.append((spec, outPath))
+
+    startTime = time.perf_counter()
+    if len(jobs) > 0:
+        initArgs = (Specs_Fonts([spec for spec, _ in jobs]), mapsDir, cachePath, cacheBytes)
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers, initializer=Worker_Init, initargs=initArgs) as pool:
+            futures = {pool.submit(Worker_Render, spec, outPath): (spec["name"], outPath) for spec, outPath in jobs}
+            for future in concurrent.futures.as_completed(futures):
+                name, outPath = futures[future]
+                try:
+                    frameCount, renderTime = future.result()
+                except Exception as e:
+                    log("FAILED " + name + ": " + type(e).__name__ + ": " + str(e))
+                    results.append({"name": name, "path": outPath, "ok": False, "error": str(e)})
+                    continue
+                log("DONE   " + name + ": " + str(frameCount) + " frames in " + format(renderTime, ".3f") + " s -> " + outPath)
+                results.append({"name": name, "path": outPath, "ok": True, "frames": frameCount, "time": renderTime})
+    totalTime = time.perf_counter() - startTime
+
+    done = [r for r in results if r["ok"]]
+    frameCount = sum([r["frames"] for r in done])
+    renderTime = sum([r["time"] for r in done])
+    log(
+        str(len(done)) + " rendered, " + str(skipCount) + " skipped, " + str(len(results) - len(done)) + " failed | "
+        + str(frameCount) + " frames in " + format(totalTime, ".3f") + " s (" + format(frameCount / max(totalTime, 1e-9), ".1f") + " frames/s, "
+        + format(len(done) / max(totalTime, 1e-9), ".2f") + " jobs/s, job time sum " + format(renderTime, ".3f") + " s)"
+    )
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render animation specs (directory of spec JSON files or a manifest) in parallel")
+    parser.add_argument("specs", help="Directory of spec JSON files or manifest JSON file")
+    parser.add_argument("--out", default=BATCH_OUTPUT_DIR, help="Output directory (default: %(default)s)")
+    parser.add_argument("--format", default=".json", choices=BATCH_OUTPUT_FORMATS, help="Output file format (default: %(default)s)")
+    parser.add_argument("--workers", type=int, default=None, help="Number of worker processes (default: CPU count)")
+    parser.add_argument("--force", action="store_true", help="Render specs again even if their output exists")
+    parser.add_argument(
+        "--cache", nargs="?", const=CacheLibrary.CACHE_PATH, default=None,
+        help="Use the result cache, at given path or at " + CacheLibrary.CACHE_PATH
+    )
+    parser.add_argument("--cache-bytes", type=int, default=CacheLibrary.CACHE_MAX_BYTES, help="Result cache byte budget (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    specs = Specs_Load(args.specs)
+    results = BatchRender(specs, args.out, args.format, args.workers, args.force, args.cache, args.cache_bytes)
+    return 0 if all([r["ok"] for r in results]) else 1
+
+# Run Code
+if __name__ == "__main__":
+    sys.exit(main())
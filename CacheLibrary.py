@@ -0,0 +1,268 @@
+"""
+Cache Library for a content addressed on disk result cache shared by processes
+"""
+
+# Imports
+import os
+import json
+import time
+import zlib
+import struct
+import sqlite3
+import hashlib
+import functools
+import threading
+import numpy as np
+
+# Main Vars
+# Cache is in a per user directory (never a shared temp directory, where other users could plant a cache file)
+CACHE_DIR = os.path.join(os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")), "AnimASCII")
+CACHE_PATH = os.environ.get("ANIMASCII_CACHE_PATH", os.path.join(CACHE_DIR, "ResultCache.sqlite"))
+CACHE_MAX_BYTES = 2**28
+# Version of cached results, part of every key - bump it whenever renderers, generators or their defaults change output
+CACHE_VERSION = 1
+CACHE_TIMEOUT = 30.0
+
+# Util Vars
+CACHE_SHARED = None
+CACHE_SHARED_LOCK = threading.Lock()
+
+# Utils Functions
+def Cache_HashUpdate(h, obj):
+    '''
+    Cache - Update hash with a type tagged encoding of obj (raises TypeError for objects without a stable content)
+    '''
+    # Objects with a content hash (like compiled ascii maps) are hashed by it
+    if obj is None or isinstance(obj, (bool, int, float)):
+        h.update(b"v" + repr(obj).encode("utf-8") + b";")
+    elif isinstance(obj, str):
+        data = obj.encode("utf-8")
+        h.update(b"s" + str(len(data)).encode("utf-8") + b":" + data)
+    elif isinstance(obj, (bytes, bytearray, memoryview)):
+        data = bytes(obj)
+        h.update(b"b" + str(len(data)).encode("utf-8") + b":" + data)
+    elif isinstance(obj, np.ndarray):
+        h.update(b"a" + str(obj.dtype.str).encode("utf-8") + str(obj.shape).encode("utf-8") + b":")
+        h.update(np.ascontiguousarray(obj).data)
+    elif isinstance(obj, (list, tuple)):
+        h.update(b"l" + str(len(obj)).encode("utf-8") + b"[")
+        for item in obj: Cache_HashUpdate(h, item)
+    elif isinstance(obj, dict):
+        h.update(b"d" + str(len(obj)).encode("utf-8") + b"{")
+        for k in sorted(obj.keys(), key=str):
+            Cache_HashUpdate(h, str(k))
+            Cache_HashUpdate(h, obj[k])
+    elif isinstance(obj, functools.partial):
+        h.update(b"p")
+        Cache_HashUpdate(h, obj.func)
+        Cache_HashUpdate(h, list(obj.args))
+        Cache_HashUpdate(h, dict(obj.keywords))
+    elif callable(obj) and hasattr(obj, "__qualname__") and "<" not in obj.__qualname__:
+        h.update(b"f" + (obj.__module__ + "." + obj.__qualname__).encode("utf-8") + b";")
+    elif isinstance(getattr(obj, "hash", None), str):
+        h.update(b"h" + obj.hash.encode("utf-8") + b";")
+    else:
+        raise TypeError("Cannot hash object of type " + type(obj).__name__ + " for a cache key")
+
+def Cache_Key(*parts):
+    '''
+    Cache - Key of parts (strings, numbers, bytes, arrays, lists, dicts, named functions and partials of them)
+    '''
+    # blake2b is used as keys can cover whole images
+    # Functions are hashed by name only, so CACHE_VERSION keeps results of older code from being served
+    h = hashlib.blake2b(digest_size=32)
+    Cache_HashUpdate(h, [CACHE_VERSION] + list(parts))
+    return h.hexdigest()
+
+def Cache_EncodeTree(obj, blobs):
+    '''
+    Cache - JSON tree of value with bytes and array data moved to blobs (raises TypeError for other objects)
+    '''
+    # Every JSON object in the tree is a one key tag ("d" dict, "t" tuple, "b" bytes, "a" array), so decoding is unambiguous
+    if obj is None or isinstance(obj, (bool, int, float, str)):
+        return obj
+    if isinstance(obj, np.generic) and obj.dtype.kind in "biuf":
+        return obj.item()
+    if isinstance(obj, list):
+        return [Cache_EncodeTree(item, blobs) for item in obj]
+    if isinstance(obj, tuple):
+        return {"t": [Cache_EncodeTree(item, blobs) for item in obj]}
+    if isinstance(obj, dict):
+        if not all([isinstance(k, str) for k in obj.keys()]):
+            raise TypeError("Cannot cache dict with non string keys")
+        return {"d": {k: Cache_EncodeTree(v, blobs) for k, v in obj.items()}}
+    if isinstance(obj, (bytes, bytearray)):
+        blobs.append(bytes(obj))
+        return {"b": len(blobs)-1}
+    if isinstance(obj, np.ndarray) and obj.dtype.kind in "biuf":
+        blobs.append(np.ascontiguousarray(obj).tobytes())
+        return {"a": [len(blobs)-1, obj.dtype.str, list(obj.shape)]}
+    raise TypeError("Cannot cache object of type " + type(obj).__name__)
+
+def Cache_DecodeTree(tree, blobs):
+    '''
+    Cache - Value of JSON tree with bytes and array data from blobs
+    '''
+    if isinstance(tree, list):
+        return [Cache_DecodeTree(item, blobs) for item in tree]
+    if not isinstance(tree, dict):
+        return tree
+    tag, content = next(iter(tree.items()))
+    if tag == "t": return tuple([Cache_DecodeTree(item, blobs) for item in content])
+    if tag == "d": return {k: Cache_DecodeTree(v, blobs) for k, v in content.items()}
+    if tag == "b": return blobs[content]
+    if tag == "a": return np.frombuffer(blobs[content[0]], dtype=np.dtype(content[1])).reshape(content[2]).copy()
+    raise ValueError("Unknown cache value tag " + repr(tag))
+
+def Cache_Encode(value):
+    '''
+    Cache - Encode value (None, numbers, strings, bytes, numeric arrays and lists, tuples and dicts of them) as compressed bytes
+    '''
+    # Values are JSON and raw bytes only (no pickles), so reading a cache file can never run code
+    blobs = []
+    tree = json.dumps([Cache_EncodeTree(value, blobs), [len(b) for b in blobs]]).encode("utf-8")
+    return zlib.compress(b"".join([struct.pack("<I", len(tree)), tree] + blobs))
+
+def Cache_Decode(data):
+    '''
+    Cache - Decode value from compressed bytes
+    '''
+    data = zlib.decompress(data)
+    treeLen = struct.unpack_from("<I", data)[0]
+    tree, blobSizes = json.loads(data[4:4+treeLen].decode("utf-8"))
+    blobs = []
+    offset = 4 + treeLen
+    for size in blobSizes:
+        blobs.append(data[offset:offset+size])
+        offset += size
+    return Cache_DecodeTree(tree, blobs)
+
+def Cache_CreateFile(path):
+    '''
+    Cache - Create cache file (and its directory) readable and writable only by the owner, if it does not exist
+    '''
+    cacheDir = os.path.dirname(os.path.abspath(path))
+    if not os.path.isdir(cacheDir): os.makedirs(cacheDir, mode=0o700, exist_ok=True)
+    try:
+        os.close(os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o600))
+    except FileExistsError:
+        pass
+
+# Main Classes
+class ResultCache:
+    '''
+    Result Cache - SQLite backed key value cache with LRU eviction under a byte budget, safe to share between processes
+    '''
+    def __init__(self, path=CACHE_PATH, maxBytes=CACHE_MAX_BYTES):
+        self.path = path
+        self.maxBytes = maxBytes
+        self.hits = 0
+        self.misses = 0
+        self.statsLock = threading.Lock()
+        # Connections are per thread (app sessions are threads) and per process
+        self.local = threading.local()
+        # SQLite creates its journal files with the permissions of the database file
+        Cache_CreateFile(path)
+        with self.Connection() as db:
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, accessed REAL NOT NULL)"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)")
+
+    def Connection(self):
+        '''
+        Result Cache - SQLite connection of this thread and process (connections are not shared with threads or forked processes)
+        '''
+        if getattr(self.local, "connection", None) is None or self.local.pid != os.getpid():
+            # WAL lets readers in other processes continue while one process writes
+            self.local.connection = sqlite3.connect(self.path, timeout=CACHE_TIMEOUT)
+            self.local.connection.execute("PRAGMA journal_mode=WAL")
+            self.local.connection.execute("PRAGMA synchronous=NORMAL")
+            self.local.pid = os.getpid()
+        return self.local.connection
+
+    def Get(self, key, default=None):
+        '''
+        Result Cache - Value of key (default if not cached), marking it as recently used
+        '''
+        db = self.Connection()
+        row = db.execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is not None:
+            try:
+                value = Cache_Decode(row[0])
+            except Exception:
+                # Unreadable entries (from an incompatible version) are dropped
+                with db: db.execute("DELETE FROM entries WHERE key = ?", (key,))
+                row = None
+        if row is None:
+            with self.statsLock: self.misses += 1
+            return default
+        with db: db.execute("UPDATE entries SET accessed = ? WHERE key = ?", (time.time(), key))
+        with self.statsLock: self.hits += 1
+        return value
+
+    def Put(self, key, value):
+        '''
+        Result Cache - Store value of key, evicting least recently used entries to stay within the byte budget
+        '''
+        # Values that cannot be encoded (see Cache_Encode) are not cached
+        try:
+            data = Cache_Encode(value)
+        except TypeError:
+            return
+        if len(data) > self.maxBytes: return
+        db = self.Connection()
+        with db:
+            db.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, accessed) VALUES (?, ?, ?, ?)",
+                (key, sqlite3.Binary(data), len(data), time.time())
+            )
+            totalBytes = db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+            if totalBytes > self.maxBytes:
+                evictKeys = []
+                for evictKey, size in db.execute("SELECT key, size FROM entries WHERE key != ? ORDER BY accessed", (key,)):
+                    if totalBytes <= self.maxBytes: break
+                    evictKeys.append((evictKey,))
+                    totalBytes -= size
+                db.executemany("DELETE FROM entries WHERE key = ?", evictKeys)
+
+    def Call(self, keyParts, Func):
+        '''
+        Result Cache - Cached result of Func() for key of keyParts
+        '''
+        key = Cache_Key(*keyParts)
+        missing = object()
+        value = self.Get(key, missing)
+        if value is missing:
+            value = Func()
+            self.Put(key, value)
+        return value
+
+    def Stats(self):
+        '''
+        Result Cache - Hit and miss counts of this process and entry count and bytes of the cache
+        '''
+        entries, totalBytes = self.Connection().execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        return {"hits": self.hits, "misses": self.misses, "entries": entries, "bytes": totalBytes, "maxBytes": self.maxBytes}
+
+    def Clear(self):
+        '''
+        Result Cache - Remove all entries
+        '''
+        with self.Connection() as db: db.execute("DELETE FROM entries")
+
+    def __repr__(self):
+        return "ResultCache(path=" + repr(self.path) + ", hits=" + str(self.hits) + ", misses=" + str(self.misses) + ")"
+
+# Main Functions
+def ResultCache_Shared(path=CACHE_PATH, maxBytes=CACHE_MAX_BYTES):
+    '''
+    Result Cache - Result cache shared by all callers of this process, created on first use
+    '''
+    # Scripts that run again on every interaction (like the streamlit app) keep one cache and its counters across runs
+    global CACHE_SHARED
+    with CACHE_SHARED_LOCK:
+        if CACHE_SHARED is None:
+            CACHE_SHARED = ResultCache(path, maxBytes)
+    return CACHE_SHARED
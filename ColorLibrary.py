@@ -0,0 +1,111 @@
+"""
+Color Library for ANSI colored ascii output
+"""
+
+# Imports
+import numpy as np
+
+import GeneratorLibrary
+
+# Main Vars
+ANSI_COLOR_MODES = ["256", "truecolor"]
+ANSI_256_LUT_BITS = 5
+ANSI_RESET = "\x1b[0m"
+
+# Util Vars
+ANSI_256_LUT = None
+ANSI_256_CODES = ["\x1b[38;5;" + str(i) + "m" for i in range(256)]
+
+# Utils Functions
+def ANSI256_LookupTable():
+    '''
+    ANSI 256 - Get 3D lookup table from quantized RGB to nearest xterm 256 color index
+    '''
+    # xterm colors 16 to 231 are a 6x6x6 color cube and 232 to 255 are 24 grays
+    global ANSI_256_LUT
+    if ANSI_256_LUT is None:
+        levels = (np.arange(2**ANSI_256_LUT_BITS) << (8 - ANSI_256_LUT_BITS)) + (1 << (7 - ANSI_256_LUT_BITS))
+        rgb = np.stack(np.meshgrid(levels, levels, levels, indexing="ij"), axis=-1).reshape(-1, 3)
+        # Nearest cube color is separable per channel
+        cubeLevels = np.array([0, 95, 135, 175, 215, 255])
+        cubeIndices = np.argmin(np.abs(rgb[:, :, None] - cubeLevels[None, None, :]), axis=2)
+        cubeDists = np.sum((rgb - cubeLevels[cubeIndices])**2, axis=1)
+        cubeIDs = 16 + 36*cubeIndices[:, 0] + 6*cubeIndices[:, 1] + cubeIndices[:, 2]
+        # Nearest gray
+        grayLevels = 8 + 10*np.arange(24)
+        grayDists = np.sum((rgb[:, None, :] - grayLevels[None, :, None])**2, axis=2)
+        grayIndices = np.argmin(grayDists, axis=1)
+        grayDists = grayDists[np.arange(rgb.shape[0]), grayIndices]
+        nearest = np.where(grayDists < cubeDists, 232 + grayIndices, cubeIDs)
+        LookupTable = nearest.astype(np.uint8).reshape((2**ANSI_256_LUT_BITS,)*3)
+        LookupTable.flags.writeable = False
+        ANSI_256_LUT = LookupTable
+    return ANSI_256_LUT
+
+def ColorCells_FromImage(I, cellsShape, valueRange=None):
+    '''
+    Color Cells - Mean uint8 RGB color of each character cell when image has an integer number of pixels per cell
+    '''
+    # cellsShape is the (..., rows, cols) shape of the character grid, I is (..., H, W, 3) of any depth
+    # Colors are scaled from valueRange (defaults to full range of integer types and [0, 1] for floats) to uint8
+    valueRange = GeneratorLibrary.Image_ValueRange(I, valueRange)
+    a = len(cellsShape) - 2
+    rows, cols = cellsShape[-2:]
+    if I.shape[a:a+2] == (rows, cols): return GeneratorLibrary.Image_To8Bit(I, valueRange)
+    cellSize = (I.shape[a] // rows, I.shape[a+1] // cols)
+    I = I[..., :rows*cellSize[0], :cols*cellSize[1], :]
+    I_cells = I.reshape(I.shape[:a] + (rows, cellSize[0], cols, cellSize[1], 3)).mean(axis=(a+1, a+3))
+    return GeneratorLibrary.Image_To8Bit(I_cells, valueRange)
+
+def ColorIDs_Quantize(I_cells, colorMode="256", colorBits=8):
+    '''
+    Color IDs - Quantize cell colors into integer color ids (xterm index for 256, packed 0xRRGGBB for truecolor)
+    '''
+    # For truecolor, colorBits < 8 drops low bits per channel so that similar neighbouring colors merge into one run
+    if colorMode == "256":
+        shift = 8 - ANSI_256_LUT_BITS
+        return ANSI256_LookupTable()[I_cells[..., 0] >> shift, I_cells[..., 1] >> shift, I_cells[..., 2] >> shift]
+    elif colorMode == "truecolor":
+        I_cells = I_cells.astype(np.uint32)
+        if colorBits < 8:
+            shift = 8 - colorBits
+            I_cells = ((I_cells >> shift) << shift) | (1 << (shift - 1))
+        return (I_cells[..., 0] << 16) | (I_cells[..., 1] << 8) | I_cells[..., 2]
+    raise ValueError("Unknown ANSI color mode " + repr(colorMode) + ", expected one of " + str(ANSI_COLOR_MODES))
+
+def ColorID_EscapeCode(colorID, colorMode="256"):
+    '''
+    Color ID - ANSI foreground escape code of a color id
+    '''
+    if colorMode == "256": return ANSI_256_CODES[colorID]
+    return "\x1b[38;2;" + str(colorID >> 16) + ";" + str((colorID >> 8) & 255) + ";" + str(colorID & 255) + "m"
+
+# Main Functions
+def ANSIColor_Render(buffer, colorIDs, colorMode="256"):
+    '''
+    ANSI Color - Render character buffer with per cell color ids as run length merged ANSI escape sequences
+    '''
+    # buffer is a (rows, cols+1) character buffer and colorIDs is (rows, cols)
+    asciiData = GeneratorLibrary.ASCIIBuffer_ToStr(buffer)
+    # Newlines and spaces show no foreground color, so they take the color of the previous ink cell
+    inkMask = np.zeros(buffer.shape, dtype=bool)
+    inkMask[:, :-1] = buffer[:, :-1] != ord(" ")
+    inkIndices = np.flatnonzero(inkMask.reshape(-1)[:-1])
+    if inkIndices.size == 0: return asciiData
+    cellIDs = np.zeros(buffer.shape, dtype=np.int64)
+    cellIDs[:, :-1] = colorIDs
+    cellIDs = cellIDs.reshape(-1)[:-1]
+    lastInk = np.zeros(cellIDs.shape[0], dtype=np.int64)
+    lastInk[inkIndices] = inkIndices
+    lastInk = np.maximum.accumulate(lastInk)
+    lastInk[:inkIndices[0]] = inkIndices[0]
+    cellIDs = cellIDs[lastInk]
+    # One escape code per run of equal colors
+    runStarts = np.concatenate([[0], np.flatnonzero(np.diff(cellIDs)) + 1, [cellIDs.shape[0]]]).tolist()
+    runIDs = cellIDs[runStarts[:-1]].tolist()
+    pieces = []
+    for i in range(len(runIDs)):
+        pieces.append(ColorID_EscapeCode(runIDs[i], colorMode))
+        pieces.append(asciiData[runStarts[i]:runStarts[i+1]])
+    pieces.append(ANSI_RESET)
+    return "".join(pieces)
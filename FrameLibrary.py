@@ -0,0 +1,144 @@
+"""
+Frame Library for lazy views over ascii animation frames
+"""
+
+# Imports
+import bisect
+import functools
+import itertools
+
+# Util Vars
+# List functions that process each frame independently of the others (like the padding functions), registered by their users
+# Only these are applied lazily one frame at a time, others get the whole list of frames
+PERFRAME_LIST_FUNCS = set()
+
+# Utils Functions
+def FrameFunc_Compose(FrameFuncs):
+    '''
+    Frame Func - Compose per frame functions applied in given order into one function
+    '''
+    def ComposedFunc(frame):
+        for func in FrameFuncs:
+            frame = func(frame)
+        return frame
+    return ComposedFunc
+
+def FrameFunc_FromListFunc(ListFunc):
+    '''
+    Frame Func - Per frame function from a function over a list of frames (like PaddingLibrary functions)
+    '''
+    return lambda frame: ListFunc([frame])[0]
+
+def ListFunc_IsPerFrame(ListFunc):
+    '''
+    List Func - Check if function over a list of frames (or a functools.partial of one) is a registered per frame function
+    '''
+    while isinstance(ListFunc, functools.partial):
+        ListFunc = ListFunc.func
+    return ListFunc in PERFRAME_LIST_FUNCS
+
+def Frames_IsSequence(frames):
+    '''
+    Frames - Check if frames can be indexed and have a length (else they can only be iterated once)
+    '''
+    return hasattr(frames, "__len__") and hasattr(frames, "__getitem__")
+
+# Main Classes
+class FrameView:
+    '''
+    Frame View - Sequence of frames computed from base frames only when read
+    '''
+    def __init__(self, frames, FrameFuncs=[]):
+        # Views of views keep a single base and a flat list of functions
+        if isinstance(frames, FrameView):
+            FrameFuncs = frames.FrameFuncs + list(FrameFuncs)
+            frames = frames.frames
+        self.frames = frames
+        self.FrameFuncs = list(FrameFuncs)
+        self.FrameFunc = FrameFunc_Compose(self.FrameFuncs)
+
+    def __len__(self):
+        return len(self.frames)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return FrameView(self.frames[index], self.FrameFuncs)
+        return self.FrameFunc(self.frames[index])
+
+    def __iter__(self):
+        return map(self.FrameFunc, self.frames)
+
+    def __repr__(self):
+        return "FrameView(frames=" + str(len(self)) + ", funcs=" + str(len(self.FrameFuncs)) + ")"
+
+class FrameTimeline:
+    '''
+    Frame Timeline - Sequence of frames stored as a table of unique frames and a timeline of (frame id, duration) entries
+    '''
+    def __init__(self, frameTable, timeline):
+        self.frameTable = list(frameTable)
+        self.timeline = [(int(frameId), int(duration)) for frameId, duration in timeline]
+        # End index (exclusive) of each timeline entry in the expanded frame sequence
+        self.timelineEnds = list(itertools.accumulate([duration for _, duration in self.timeline]))
+
+    def FrameId(self, index):
+        '''
+        Frame Timeline - Id (in frame table) of frame at index of expanded frame sequence
+        '''
+        if index < 0: index += len(self)
+        if not 0 <= index < len(self): raise IndexError("Frame index out of range")
+        return self.timeline[bisect.bisect_right(self.timelineEnds, index)][0]
+
+    def __len__(self):
+        return self.timelineEnds[-1] if len(self.timelineEnds) > 0 else 0
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return self.frameTable[self.FrameId(index)]
+
+    def __iter__(self):
+        for frameId, duration in self.timeline:
+            yield from itertools.repeat(self.frameTable[frameId], duration)
+
+    def __repr__(self):
+        return "FrameTimeline(frames=" + str(len(self)) + ", unique=" + str(len(self.frameTable)) + ", entries=" + str(len(self.timeline)) + ")"
+
+# Main Functions
+def Frames_Intern(frames):
+    '''
+    Frames - Intern frames into a timeline storing each unique frame once, with consecutive duplicates merged into one entry
+    '''
+    if isinstance(frames, FrameTimeline): return frames
+    frameIds = {}
+    timeline = []
+    for frame in frames:
+        frameId = frameIds.setdefault(frame, len(frameIds))
+        if len(timeline) > 0 and timeline[-1][0] == frameId:
+            timeline[-1][1] += 1
+        else:
+            timeline.append([frameId, 1])
+    return FrameTimeline(frameIds.keys(), timeline)
+
+def Frames_Collect(frames, collected):
+    '''
+    Frames - Iterate frames while appending each to collected list
+    '''
+    for frame in frames:
+        collected.append(frame)
+        yield frame
+
+def Frames_PostProcess(frames, postProcessFuncs, lazy=True):
+    '''
+    Frames - Apply post process functions (over lists of frames), lazily one frame at a time if lazy
+    '''
+    # Lazy post processing needs functions that process each frame independently, like the padding functions
+    # If any function is not a registered per frame function, all are applied to the whole list of frames
+    if not lazy or not all([ListFunc_IsPerFrame(func) for func in postProcessFuncs]):
+        frames = list(frames)
+        for func in postProcessFuncs:
+            frames = func(frames)
+        return frames
+    FrameFuncs = [FrameFunc_FromListFunc(func) for func in postProcessFuncs]
+    if Frames_IsSequence(frames): return FrameView(frames, FrameFuncs)
+    return map(FrameFunc_Compose(FrameFuncs), frames)
@@ -4,53 +4,855 @@ Generator Library for animation generator functions
 
 # Imports
 import cv2
+import itertools
+import threading
+import collections
 import numpy as np
 
+import ASCIIMapLibrary
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+# Main Vars
+GRADIENT_DIRECTION_BUCKETS = 254
+GLYPH_CHARSET = "".join(map(chr, range(32, 127)))
+GLYPH_CELL_SIZE = (12, 6)
+DITHER_MODES = ["bayer", "floyd-steinberg"]
+BUILDUP_DIRECTIONS = ["left-to-right", "right-to-left", "top-to-bottom", "bottom-to-top"]
+TEXT_EFFECT_MODES = ["in", "out"]
+TEXT_DENSITY_RAMP = " .:-=+*#%@"
+SIMULATION_SIZE = (80, 24)
+SIMULATION_FRAMES = 100
+VALUE_BINS_CHUNK = 2**16
+VALUE_BINS_COMPARE_EDGES = 16
+VALUE_LOOKUP_TABLES_MAX = 16
+
+# Util Vars
+GRADIENT_DIRECTION_TABLES = {}
+GRADIENT_SCRATCH = threading.local()
+GLYPH_MATRICES = {}
+BAYER_MATRICES = {}
+# Value ranges of float images depend on their data, so only the least recently used tables are kept
+VALUE_LOOKUP_TABLES = collections.OrderedDict()
+VALUE_LOOKUP_TABLES_LOCK = threading.Lock()
+SIMULATION_ASCII_MAP = ASCIIMapLibrary.ASCIIMap_FromChars(TEXT_DENSITY_RAMP, "Density")
+
+# Utils Functions
+def ASCIIBuffer_Create(shape, dtype=np.uint8):
+    '''
+    ASCII Buffer - Create character buffer for frames of given shape with a built in newline column
+    '''
+    buffer = np.empty(tuple(shape[:-1]) + (shape[-1]+1,), dtype=np.dtype(dtype).newbyteorder("<"))
+    buffer[..., -1] = ord("\n")
+    return buffer
+
+def ASCIIBuffer_Check(buffer, shape, dtype):
+    '''
+    ASCII Buffer - Check if buffer can hold frames of given shape and character codes of given dtype
+    '''
+    bufferShape = tuple(shape[:-1]) + (shape[-1]+1,)
+    if buffer.shape != bufferShape:
+        raise ValueError("ASCII buffer shape " + str(buffer.shape) + " does not match required shape " + str(bufferShape))
+    if buffer.dtype.itemsize < np.dtype(dtype).itemsize:
+        raise ValueError("ASCII buffer dtype " + str(buffer.dtype) + " cannot hold character codes of dtype " + str(np.dtype(dtype)))
+
+def ASCIIBuffer_ToStr(buffer):
+    '''
+    ASCII Buffer - Convert character buffer to text
+    '''
+    encoding = "latin-1" if buffer.dtype.itemsize == 1 else "utf-32-le"
+    asciiData = buffer.tobytes().decode(encoding)[:-1]
+    return asciiData
+
+def ASCIIBuffer_ToFrames(buffer):
+    '''
+    ASCII Buffer - Convert character buffer of a batch of frames to list of texts
+    '''
+    # Decode the whole batch once and slice out the fixed length frames
+    frameLen = buffer.shape[-2] * buffer.shape[-1]
+    if frameLen == 0: return [""] * buffer.shape[0]
+    asciiData = ASCIIBuffer_ToStr(buffer) + "\n"
+    frames = [asciiData[i:i+frameLen-1] for i in range(0, buffer.shape[0]*frameLen, frameLen)]
+    return frames
+
+def ASCIIBuffer_ToBytes(buffer, encoding="utf-8"):
+    '''
+    ASCII Buffer - Convert character buffer to bytes
+    '''
+    if buffer.dtype.itemsize == 1: return buffer.reshape(-1)[:-1].tobytes()
+    return ASCIIBuffer_ToStr(buffer).encode(encoding)
+
+def TextGrid_Create(text):
+    '''
+    Text Grid - Character buffer (with newline column) of text lines padded with spaces to max line width, and line lengths
+    '''
+    textLines = text.split("\n")
+    lineLens = np.array(list(map(len, textLines)), dtype=np.int64)
+    width = int(lineLens.max())
+    paddedText = "\n".join([l.ljust(width) for l in textLines]) + "\n"
+    grid = np.frombuffer(paddedText.encode("utf-32-le"), dtype="<u4").reshape(len(textLines), width+1)
+    grid = grid.astype(np.uint8) if grid.max() < 256 else grid.copy()
+    return grid, lineLens
+
+def TextGrid_Blank(grid):
+    '''
+    Text Grid - Character buffer of same shape as grid filled with spaces
+    '''
+    blank = np.full_like(grid, ord(" "))
+    blank[..., -1] = ord("\n")
+    return blank
+
+def TextGrid_Chars(grid, chars):
+    '''
+    Text Grid - Character codes of chars, and grid converted to a dtype that can hold them
+    '''
+    codes = np.array([ord(c) for c in chars], dtype=np.uint32)
+    if codes.shape[0] > 0 and codes.max() > 255 and grid.dtype.itemsize == 1:
+        grid = grid.astype("<u4")
+    return codes.astype(grid.dtype), grid
+
+def TextGrid_Coords(grid, direction):
+    '''
+    Text Grid - Distance (in rows or columns) of each cell from the start edge of direction (one of BUILDUP_DIRECTIONS)
+    '''
+    height, width = grid.shape[0], grid.shape[1]-1
+    rows, cols = np.indices(grid.shape)
+    coords = {
+        "left-to-right": cols,
+        "right-to-left": width-1 - cols,
+        "top-to-bottom": rows,
+        "bottom-to-top": height-1 - rows
+    }
+    return coords[direction]
+
+def TextEffect_Option(data, key, options):
+    '''
+    Text Effect - Option from data (default is first of options), checked to be one of options
+    '''
+    value = data.get(key, options[0])
+    if value not in options:
+        raise ValueError("Unknown " + key + " " + repr(value) + ", expected one of " + str(options))
+    return value
+
+def TextEffect_Count(data, key, default, minimum=1):
+    '''
+    Text Effect - Integer option from data, checked to be at least minimum
+    '''
+    value = int(data.get(key, default))
+    if value < minimum:
+        raise ValueError("Text effect " + key + " must be at least " + str(minimum) + ", got " + str(value))
+    return value
+
+def Simulation_Params(data):
+    '''
+    Simulation - Frame width and height, frame steps (endless if data["frames"] is None) and random generator seeded by data["seed"]
+    '''
+    width = TextEffect_Count(data, "width", SIMULATION_SIZE[0])
+    height = TextEffect_Count(data, "height", SIMULATION_SIZE[1])
+    if "frames" in data.keys() and data["frames"] is None:
+        steps = itertools.count()
+    else:
+        steps = range(TextEffect_Count(data, "frames", SIMULATION_FRAMES, 0))
+    rng = np.random.default_rng(data.get("seed", None))
+    return width, height, steps, rng
+
+def SimulationFields_MatrixRain(width, height, steps, rng, speedRange=(0.3, 1.0), trailRange=(4, 16)):
+    '''
+    Simulation Fields - Matrix Rain - Drops falling down each column with fading trails
+    '''
+    # Head rows, speeds (rows per frame) and trail lengths of the drops are arrays over columns
+    heads = rng.uniform(-height, height, width)
+    speeds = rng.uniform(speedRange[0], speedRange[1], width)
+    trails = rng.integers(trailRange[0], trailRange[1]+1, width).astype(np.float64)
+    rows = np.arange(height, dtype=np.float64)[:, None]
+    field = np.empty((height, width), dtype=np.uint8)
+    for _ in steps:
+        dist = heads[None, :] - rows
+        brightness = np.clip(255.0 * (1.0 - dist / trails[None, :]), 0.0, 255.0)
+        np.copyto(field, np.where(dist >= 0, brightness, 0.0), casting="unsafe")
+        yield field
+        heads += speeds
+        # Drops whose trail has left the frame start again above it
+        done = heads - trails > height
+        doneCount = int(np.count_nonzero(done))
+        heads[done] = -rng.uniform(0, height, doneCount)
+        speeds[done] = rng.uniform(speedRange[0], speedRange[1], doneCount)
+        trails[done] = rng.integers(trailRange[0], trailRange[1]+1, doneCount)
+
+def SimulationFields_Starfield(width, height, steps, rng, starCount=200, speed=0.02, near=0.05):
+    '''
+    Simulation Fields - Starfield - Stars flying towards the viewer, brighter as they get closer
+    '''
+    # Stars have positions x, y in [-1, 1] and depth z in (near, 1], projected onto the frame by perspective division
+    x, y = rng.uniform(-1, 1, starCount), rng.uniform(-1, 1, starCount)
+    z = rng.uniform(near, 1, starCount)
+    field = np.zeros((height, width), dtype=np.uint8)
+    for _ in steps:
+        sx = np.floor((x / z + 1.0) * (0.5 * width)).astype(np.intp)
+        sy = np.floor((y / z + 1.0) * (0.5 * height)).astype(np.intp)
+        visible = (sx >= 0) & (sx < width) & (sy >= 0) & (sy < height)
+        brightness = (255.0 * (1.0 - z[visible])).astype(np.uint8)
+        # Stars are drawn from dim to bright, so the brightest star in a cell is kept
+        order = np.argsort(brightness, kind="stable")
+        field[...] = 0
+        field[sy[visible][order], sx[visible][order]] = brightness[order]
+        yield field
+        z -= speed
+        # Stars that passed the viewer or left the frame start again far away
+        done = (z <= near) | ~visible
+        doneCount = int(np.count_nonzero(done))
+        x[done], y[done] = rng.uniform(-1, 1, doneCount), rng.uniform(-1, 1, doneCount)
+        z[done] = 1.0
+
+def SimulationFields_Fire(width, height, steps, rng, sparkChance=0.6, flicker=0.15):
+    '''
+    Simulation Fields - Fire - Heat rising from random sparks below the frame, spreading and cooling as it rises
+    '''
+    # Heat field has a hidden row of sparks below the frame and a cold column on both sides
+    # Sparks are hotter than the brightest value, cooling (with mean flicker) is set so that heat fades out near the top of the frame
+    heat = np.zeros((height+1, width+2), dtype=np.float64)
+    cooling = (0.05 ** (1.0 / max(1, height))) / (1.0 - 0.5*flicker)
+    field = np.empty((height, width), dtype=np.uint8)
+    # Warm up until heat from the first sparks reaches the top
+    for i in itertools.chain(range(-height, 0), steps):
+        heat[-1, 1:-1] = np.where(rng.random(width) < sparkChance, 512.0, 0.0)
+        # Each cell becomes the cooled mean of the three cells below it, with the cell right below counted twice
+        heat[:-1, 1:-1] = (heat[1:, :-2] + 2.0*heat[1:, 1:-1] + heat[1:, 2:]) \
+            * (0.25 * cooling) * rng.uniform(1.0 - flicker, 1.0, (height, width))
+        if i < 0: continue
+        np.copyto(field, np.minimum(heat[:height, 1:-1], 255.0), casting="unsafe")
+        yield field
+
+def Simulation_Render(fields, data):
+    '''
+    Simulation - Render uint8 value fields through lookup table of data["asciiMap"] (image ascii map, default density ramp) into frames
+    '''
+    ASCII_MAP = ASCIIMapLibrary.ASCIIMap_Compile(data.get("asciiMap", SIMULATION_ASCII_MAP))
+    buffer = None
+    for field in fields:
+        buffer = RenderASCII_LookupTable(field, ASCII_MAP.lookupTable, buffer)
+        yield ASCIIBuffer_ToStr(buffer)
+
+def ASCIIBuffer_StretchX(buffer, hStretch=1, out=None):
+    '''
+    ASCII Buffer - Repeat each character hStretch times along its row into a wider character buffer
+    '''
+    if hStretch == 1 and out is None: return buffer
+    shape = buffer.shape[:-1] + ((buffer.shape[-1]-1)*hStretch,)
+    if out is None:
+        out = ASCIIBuffer_Create(shape, buffer.dtype)
+    else:
+        ASCIIBuffer_Check(out, shape, buffer.dtype)
+    # One strided copy per repeat
+    for i in range(hStretch):
+        out[..., i:-1:hStretch] = buffer[..., :-1]
+    return out
+
+def GradientDirection_LookupTable(directionChars, fillStr):
+    '''
+    Gradient Direction - Lookup table from gradient direction bucket to edge character
+    '''
+    # Bucket 0 is for non edge pixels, bucket b > 0 is for gradient angle (b-1) * 360 / GRADIENT_DIRECTION_BUCKETS
+    # Edges are perpendicular to gradient, so gradient angle 0 (horizontal) maps to first char ("|")
+    key = (directionChars, fillStr)
+    if key not in GRADIENT_DIRECTION_TABLES.keys():
+        LookupTable = np.full(256, ord(fillStr), dtype=np.uint32)
+        bucketAngles = np.arange(GRADIENT_DIRECTION_BUCKETS+1) * (360.0 / GRADIENT_DIRECTION_BUCKETS)
+        charIndices = np.round(bucketAngles / (180.0 / len(directionChars))).astype(int) % len(directionChars)
+        LookupTable[1:] = np.array(list(map(ord, directionChars)))[charIndices]
+        if LookupTable.max() < 256:
+            LookupTable = LookupTable.astype(np.uint8)
+        LookupTable.flags.writeable = False
+        GRADIENT_DIRECTION_TABLES[key] = LookupTable
+    return GRADIENT_DIRECTION_TABLES[key]
+
+def GradientDirection_Scratch(shape):
+    '''
+    Gradient Direction - Get per thread scratch arrays for gradient computation of given frame shape
+    '''
+    # Reusing scratch arrays avoids fresh page faults on every frame, which cost more than the gradients themselves
+    scratch = getattr(GRADIENT_SCRATCH, "arrays", None)
+    if scratch is None or scratch[0].shape[1:] != tuple(shape):
+        scratch = [np.empty((4,) + tuple(shape), dtype=np.float32), np.empty((2,) + tuple(shape), dtype=np.uint8)]
+        GRADIENT_SCRATCH.arrays = scratch
+    return scratch
+
+def GradientDirection_Buckets(I_g, threshold, I_mag):
+    '''
+    Gradient Direction - Compute Sobel gradient direction buckets (0 for non edges) and magnitude of a gray image
+    '''
+    (gx, gy, angle, mag), (I_edgeMask, I_buckets) = GradientDirection_Scratch(I_g.shape)
+    cv2.Sobel(I_g, cv2.CV_32F, 1, 0, dst=gx, ksize=3)
+    cv2.Sobel(I_g, cv2.CV_32F, 0, 1, dst=gy, ksize=3)
+    cv2.phase(gx, gy, angle, angleInDegrees=True)
+    cv2.magnitude(gx, gy, mag)
+    cv2.convertScaleAbs(angle, I_buckets, GRADIENT_DIRECTION_BUCKETS / 360.0, 1.0)
+    cv2.compare(mag, float(threshold), cv2.CMP_GE, I_edgeMask)
+    cv2.bitwise_and(I_buckets, I_edgeMask, I_buckets)
+    cv2.convertScaleAbs(mag, I_mag)
+    return I_buckets
+
+def Glyphs_Rasterize(charSet, cellSize=GLYPH_CELL_SIZE, upscale=4):
+    '''
+    Glyphs - Rasterize characters into (len(charSet), H, W) float bitmaps of given cell size (H, W) with ink as 1
+    '''
+    # Draw each character centered on an upscaled canvas and area downsample for anti-aliased bitmaps
+    font = cv2.FONT_HERSHEY_PLAIN
+    canvasSize = (cellSize[0]*upscale, cellSize[1]*upscale)
+    (refW, refH), refBaseline = cv2.getTextSize("Mg", font, 1.0, 1)
+    fontScale = min(0.9 * canvasSize[0] / (refH + refBaseline), 0.9 * canvasSize[1] / (refW / 2))
+    thickness = max(1, int(round(fontScale)))
+    glyphs = np.zeros((len(charSet), cellSize[0], cellSize[1]), dtype=np.float32)
+    for i, c in enumerate(charSet):
+        canvas = np.zeros(canvasSize, dtype=np.uint8)
+        (w, h), baseline = cv2.getTextSize(c, font, fontScale, thickness)
+        origin = ((canvasSize[1] - w) // 2, (canvasSize[0] + h - baseline) // 2)
+        cv2.putText(canvas, c, origin, font, fontScale, 255, thickness, cv2.LINE_AA)
+        glyphs[i] = cv2.resize(canvas, (cellSize[1], cellSize[0]), interpolation=cv2.INTER_AREA) / 255.0
+    return glyphs
+
+def Glyphs_Matrix(charSet, cellSize=GLYPH_CELL_SIZE):
+    '''
+    Glyphs - Get cached glyph matching matrix, bias and character code table for a character set and cell size
+    '''
+    # Nearest glyph g of cell c minimises |c - g|^2, which is the maximum of c.g - |g|^2 / 2
+    key = (charSet, tuple(cellSize))
+    if key not in GLYPH_MATRICES.keys():
+        if not 0 < len(charSet) <= 256:
+            raise ValueError("Glyph character set must have 1 to 256 characters, got " + str(len(charSet)))
+        glyphs = Glyphs_Rasterize(charSet, cellSize).reshape(len(charSet), -1)
+        glyphBias = -0.5 * np.sum(glyphs**2, axis=1)
+        CodeTable = np.zeros(256, dtype=np.uint32)
+        CodeTable[:len(charSet)] = list(map(ord, charSet))
+        if CodeTable.max() < 256:
+            CodeTable = CodeTable.astype(np.uint8)
+        for arr in (glyphs, glyphBias, CodeTable):
+            arr.flags.writeable = False
+        GLYPH_MATRICES[key] = (glyphs.T.copy(), glyphBias, CodeTable)
+    return GLYPH_MATRICES[key]
+
+def Dither_BayerMatrix(size):
+    '''
+    Dither - Bayer threshold matrix of given power of 2 size with values in (-0.5, 0.5)
+    '''
+    if size not in BAYER_MATRICES.keys():
+        M = np.zeros((1, 1))
+        while M.shape[0] < size:
+            M = np.block([[4*M, 4*M + 2], [4*M + 3, 4*M + 1]])
+        BAYER_MATRICES[size] = ((M + 0.5) / M.size - 0.5).astype(np.float32)
+    return BAYER_MATRICES[size]
+
+def Dither_Bayer(I_g, ASCII_MAP, size=4):
+    '''
+    Dither - Ordered (Bayer) dithering of gray image (or stack of images) by adding tiled threshold matrix before lookup
+    '''
+    # Threshold amplitude is the average spacing between map levels
+    levelStep = 256.0 / ASCII_MAP.levelCount
+    M = Dither_BayerMatrix(size) * levelStep
+    H, W = I_g.shape[-2:]
+    M = np.tile(M, (-(-H // size), -(-W // size)))[:H, :W]
+    I_dither = I_g + M
+    np.clip(I_dither, 0, 255, out=I_dither)
+    return np.rint(I_dither).astype(np.uint8)
+
+def Dither_FloydSteinberg_Kernel(I_f, LevelTable, I_out):
+    '''
+    Dither - Floyd Steinberg error diffusion kernel (compiled with numba if available)
+    '''
+    H, W = I_f.shape
+    for y in range(H):
+        for x in range(W):
+            v = I_f[y, x]
+            vi = min(255, max(0, int(v + 0.5)))
+            I_out[y, x] = vi
+            e = v - LevelTable[vi]
+            if x+1 < W: I_f[y, x+1] += e * 0.4375
+            if y+1 < H:
+                if x > 0: I_f[y+1, x-1] += e * 0.1875
+                I_f[y+1, x] += e * 0.3125
+                if x+1 < W: I_f[y+1, x+1] += e * 0.0625
+
+Dither_FloydSteinberg_KernelJIT = None if numba is None else numba.njit(cache=True)(Dither_FloydSteinberg_Kernel)
+
+def Dither_FloydSteinberg_Rows(I_f, LevelTable, I_out):
+    '''
+    Dither - Floyd Steinberg error diffusion, row vectorized (used when numba is not available)
+    '''
+    # Only the error carried to the right neighbour is sequential, errors to the next row are spread with array ops
+    H, W = I_f.shape
+    LevelTable = LevelTable.tolist()
+    rowErrors = np.empty(W, dtype=np.float32)
+    for y in range(H):
+        row = I_f[y].tolist()
+        rowOut = [0] * W
+        e = 0.0
+        for x in range(W):
+            v = row[x] + e * 0.4375
+            vi = min(255, max(0, int(v + 0.5)))
+            rowOut[x] = vi
+            e = v - LevelTable[vi]
+            row[x] = e
+        I_out[y] = rowOut
+        if y+1 < H:
+            rowErrors[:] = row
+            I_f[y+1, :-1] += rowErrors[1:] * 0.1875
+            I_f[y+1] += rowErrors * 0.3125
+            I_f[y+1, 1:] += rowErrors[:-1] * 0.0625
+
+def Dither_FloydSteinberg(I_g, ASCII_MAP):
+    '''
+    Dither - Floyd Steinberg error diffusion dithering of gray image (or stack of images) towards map levels
+    '''
+    I_f = I_g.astype(np.float32)
+    I_out = np.empty(I_g.shape, dtype=np.uint8)
+    DitherKernel = Dither_FloydSteinberg_Rows if Dither_FloydSteinberg_KernelJIT is None else Dither_FloydSteinberg_KernelJIT
+    I_f_frames, I_out_frames = I_f.reshape((-1,) + I_g.shape[-2:]), I_out.reshape((-1,) + I_g.shape[-2:])
+    for i in range(I_f_frames.shape[0]):
+        DitherKernel(I_f_frames[i], ASCII_MAP.levelTable, I_out_frames[i])
+    return I_out
+
+def Image_Dither(I_g, ASCII_MAP, dither=None, ditherSize=4):
+    '''
+    Image - Dither gray image (or stack of images) towards map levels
+    '''
+    if dither is None: return I_g
+    elif dither == "bayer": return Dither_Bayer(I_g, ASCII_MAP, ditherSize)
+    elif dither == "floyd-steinberg": return Dither_FloydSteinberg(I_g, ASCII_MAP)
+    raise ValueError("Unknown dither mode " + repr(dither) + ", expected one of " + str(DITHER_MODES))
+
+def Image_Tone(I_g, toneCurve=None):
+    '''
+    Image - Apply 256 entry tone curve to gray image (or stack of images)
+    '''
+    if toneCurve is None: return I_g
+    I_tone = np.empty(I_g.shape, dtype=np.uint8)
+    if I_g.dtype == np.uint8 and I_g.size > 0:
+        cv2.LUT(np.ascontiguousarray(I_g).reshape(-1, I_g.shape[-1]), toneCurve, dst=I_tone.reshape(-1, I_g.shape[-1]))
+    else:
+        np.take(toneCurve, I_g, out=I_tone, mode="clip")
+    return I_tone
+
+def Image_Gray(I, batch=False):
+    '''
+    Image - Convert RGB image (or batch of images) to grayscale
+    '''
+    if I.ndim == (4 if batch else 3):
+        # OpenCV converts uint8, uint16 and float32 natively, other depths use the same weights in numpy
+        if I.dtype in (np.uint8, np.uint16, np.float32):
+            I_g = cv2.cvtColor(I.reshape(-1, I.shape[-2], I.shape[-1]), cv2.COLOR_RGB2GRAY)
+            return I_g.reshape(I.shape[:-1])
+        return np.dot(I[..., :3], [0.299, 0.587, 0.114])
+    return I
+
+def Image_ValueRange(I, valueRange=None):
+    '''
+    Image - Value range (black, white) of image, defaults to full range of integer types and [0, 1] for floats
+    '''
+    if valueRange is not None: return valueRange
+    if np.issubdtype(I.dtype, np.floating): return (0.0, 1.0)
+    return (0, np.iinfo(I.dtype).max)
+
+def Image_To8Bit(I_g, valueRange=None):
+    '''
+    Image - Scale gray image (or stack of images) of any depth from its value range to uint8 in one pass
+    '''
+    if I_g.dtype == np.uint8 and valueRange is None: return I_g
+    lo, hi = Image_ValueRange(I_g, valueRange)
+    alpha = 255.0 / (hi - lo)
+    if I_g.size == 0: return np.empty(I_g.shape, dtype=np.uint8)
+    if I_g.dtype in (np.uint8, np.uint16, np.int16, np.float32, np.float64):
+        # Saturating scale with rounding, same as an 8 bit conversion in OpenCV
+        I_flat = np.ascontiguousarray(I_g).reshape(-1, I_g.shape[-1])
+        return cv2.addWeighted(I_flat, alpha, I_flat, 0.0, -lo * alpha, dtype=cv2.CV_8U).reshape(I_g.shape)
+    return np.rint(np.clip((I_g - lo) * alpha, 0, 255)).astype(np.uint8)
+
 # Main Functions
 def GenerateAnimation_TextBased_BuildUpText(data):
     '''
     Generate Animation - Text Based - Build Up Text
     '''
     # Build up the given text letter by letter as animation - left to right - multi lines supported
-    text = data["text"]
-    textLines = text.split("\n")
-    lineLens = list(map(len, textLines))
-    textDims = [max(lineLens), len(textLines)]
-    animList = []
-    for i in range(1, textDims[0]):
-        lines = []
-        for l in textLines:
-            line = l[:i] + " "*(textDims[0]-i)
-            lines.append(line)
-        frame = "\n".join(lines)
-        animList.append(frame)
+    animList = list(GenerateAnimation_TextBased_BuildUpText_Lazy(data))
     return animList
 
-def GenerateASCII_ImageBased_Fill(I, IMAGE_FILL_ASCII):
+def GenerateAnimation_TextBased_BuildUpText_Lazy(data):
+    '''
+    Generate Animation - Text Based - Build Up Text - Frames generated one at a time
+    '''
+    # Reveals data["step"] (default 1) more columns or rows per frame in data["direction"] (one of BUILDUP_DIRECTIONS)
+    # Left to right frames are the same as l[:i] + " "*(width-i) for each line l, so lines shorter than i lose some padding
+    # Text is padded into one character grid and each frame only copies the newly revealed cells into a reused frame buffer
+    direction = TextEffect_Option(data, "direction", BUILDUP_DIRECTIONS)
+    step = TextEffect_Count(data, "step", 1)
+    grid, lineLens = TextGrid_Create(data["text"])
+    height, width = grid.shape[0], grid.shape[1]-1
+    frame = TextGrid_Blank(grid)
+    rowStarts = range(0, height*(width+1), width+1)
+    size = height if direction in ["top-to-bottom", "bottom-to-top"] else width
+    revealed = 0
+    for i in range(1, size, step):
+        if direction == "left-to-right":
+            frame[:, revealed:i] = grid[:, revealed:i]
+        elif direction == "right-to-left":
+            frame[:, width-i:width-revealed] = grid[:, width-i:width-revealed]
+        elif direction == "top-to-bottom":
+            frame[revealed:i] = grid[revealed:i]
+        else:
+            frame[height-i:height-revealed] = grid[height-i:height-revealed]
+        revealed = i
+        if direction == "left-to-right" and lineLens.min() < i:
+            # Drop cells [len(l), i) of lines shorter than i from the decoded frame
+            frameText = ASCIIBuffer_ToStr(frame) + "\n"
+            yield "".join([
+                frameText[r:r+n] + frameText[r+i:r+width+1] if n < i else frameText[r:r+width+1]
+                for r, n in zip(rowStarts, lineLens.tolist())
+            ])[:-1]
+        else:
+            yield ASCIIBuffer_ToStr(frame)
+
+def GenerateAnimation_TextBased_Marquee(data):
+    '''
+    Generate Animation - Text Based - Marquee - Text scrolling right to left through a window, one loop of frames
+    '''
+    # data["width"] is the window width (default text width) and data["gap"] the spaces between repeats of the text (default window width)
+    # Each frame gathers the window columns from a tape of text and gap at the scroll offset, moving data["step"] columns per frame
+    grid, _ = TextGrid_Create(data["text"])
+    width = TextEffect_Count(data, "width", grid.shape[1]-1, 0)
+    gap = TextEffect_Count(data, "gap", width, 0)
+    step = TextEffect_Count(data, "step", 1)
+    tape = np.concatenate([grid[:, :-1], np.full((grid.shape[0], gap), ord(" "), dtype=grid.dtype)], axis=1)
+    frame = ASCIIBuffer_Create((grid.shape[0], width), grid.dtype)
+    cols = np.arange(width)
+    for offset in range(0, tape.shape[1], step):
+        frame[:, :-1] = tape[:, (cols + offset) % tape.shape[1]]
+        yield ASCIIBuffer_ToStr(frame)
+
+def GenerateAnimation_TextBased_Typewriter(data):
+    '''
+    Generate Animation - Text Based - Typewriter - Text typed in reading order with a cursor on the next character
+    '''
+    # data["step"] characters are typed per frame, data["cursor"] is the cursor character ("" for no cursor)
+    # Frames go from no text to the full text, both included
+    grid, lineLens = TextGrid_Create(data["text"])
+    cursor, grid = TextGrid_Chars(grid, data.get("cursor", "_"))
+    step = TextEffect_Count(data, "step", 1)
+    # Flat positions of text characters (without line padding) in reading order
+    cols = np.arange(grid.shape[1])
+    order = np.flatnonzero(cols[None, :] < lineLens[:, None])
+    charCount = order.shape[0]
+    gridFlat = grid.reshape(-1)
+    frame = TextGrid_Blank(grid)
+    frameFlat = frame.reshape(-1)
+    typed = 0
+    for k in list(range(0, charCount, step)) + [charCount]:
+        frameFlat[order[typed:k]] = gridFlat[order[typed:k]]
+        typed = k
+        if k < charCount and cursor.shape[0] > 0:
+            frameFlat[order[k]] = cursor[0]
+            yield ASCIIBuffer_ToStr(frame)
+            frameFlat[order[k]] = ord(" ")
+        else:
+            yield ASCIIBuffer_ToStr(frame)
+
+def GenerateAnimation_TextBased_Wipe(data):
+    '''
+    Generate Animation - Text Based - Wipe - Text revealed (or hidden) by an edge sweeping across in a direction
+    '''
+    # data["direction"] is one of BUILDUP_DIRECTIONS, data["mode"] is "in" (reveal) or "out" (hide), data["step"] rows or columns per frame
+    # Frames go from no text to the full text (reversed for "out"), both included
+    direction = TextEffect_Option(data, "direction", BUILDUP_DIRECTIONS)
+    mode = TextEffect_Option(data, "mode", TEXT_EFFECT_MODES)
+    step = TextEffect_Count(data, "step", 1)
+    grid, _ = TextGrid_Create(data["text"])
+    coords = TextGrid_Coords(grid, direction)
+    blank = TextGrid_Blank(grid)
+    frame = blank.copy()
+    size = grid.shape[0] if direction in ["top-to-bottom", "bottom-to-top"] else grid.shape[1]-1
+    edges = list(range(0, size, step)) + [size]
+    if mode == "out": edges = edges[::-1]
+    for edge in edges:
+        revealMask = coords < edge
+        np.copyto(frame, grid, where=revealMask)
+        np.copyto(frame, blank, where=~revealMask)
+        yield ASCIIBuffer_ToStr(frame)
+
+def GenerateAnimation_TextBased_DensityFade(data):
+    '''
+    Generate Animation - Text Based - Density Fade - Characters fade in (or out) through a ramp of increasingly dense characters
+    '''
+    # data["ramp"] is ordered from sparse to dense starting with space, each character rises through it up to its own density
+    # Characters not in the ramp rise up to the densest ramp character and the last frame is the text itself
+    # data["frames"] is the number of frames (default ramp length), data["mode"] is "in" or "out"
+    mode = TextEffect_Option(data, "mode", TEXT_EFFECT_MODES)
+    grid, _ = TextGrid_Create(data["text"])
+    ramp, grid = TextGrid_Chars(grid, data.get("ramp", TEXT_DENSITY_RAMP))
+    frameCount = TextEffect_Count(data, "frames", ramp.shape[0], 2)
+    # Ramp level of each cell
+    levels = np.full(grid.shape, ramp.shape[0]-1, dtype=np.float64)
+    for level in range(ramp.shape[0]-1, -1, -1):
+        levels[grid == ramp[level]] = level
+    levels = levels[:, :-1]
+    frame = TextGrid_Blank(grid)
+    frameSteps = range(frameCount) if mode == "in" else range(frameCount-1, -1, -1)
+    for k in frameSteps:
+        if k == frameCount-1:
+            frame[...] = grid
+        else:
+            frame[:, :-1] = ramp[(levels * (k / (frameCount-1))).astype(np.int64)]
+        yield ASCIIBuffer_ToStr(frame)
+
+def GenerateAnimation_TextBased_ColumnWave(data):
+    '''
+    Generate Animation - Text Based - Column Wave - Columns of text shifted up and down along a travelling sine wave
+    '''
+    # data["amplitude"] is the max shift in rows (frames are 2*amplitude rows taller than the text)
+    # data["wavelength"] is the wave length in columns and data["frames"] the frames per wave period (one loop)
+    grid, _ = TextGrid_Create(data["text"])
+    amplitude = TextEffect_Count(data, "amplitude", 2, 0)
+    wavelength = TextEffect_Count(data, "wavelength", 16)
+    period = TextEffect_Count(data, "frames", 16)
+    height, width = grid.shape[0], grid.shape[1]-1
+    # Tape has 2*amplitude blank rows on both sides of the text, so every shifted row index stays inside it
+    tape = np.full((height + 4*amplitude, width), ord(" "), dtype=grid.dtype)
+    tape[2*amplitude:2*amplitude+height] = grid[:, :-1]
+    frame = ASCIIBuffer_Create((height + 2*amplitude, width), grid.dtype)
+    # Flat tape index of each unshifted frame cell, a shift of each column moves it by whole tape rows
+    cellIndex = ((np.arange(height + 2*amplitude)[:, None] + amplitude) * width + np.arange(width)[None, :]).astype(np.intp)
+    phase = 2*np.pi * np.arange(width) / wavelength
+    for k in range(period):
+        shifts = np.rint(amplitude * np.sin(phase - 2*np.pi * k / period)).astype(np.intp)
+        frame[:, :-1] = np.take(tape.reshape(-1), cellIndex - shifts * width)
+        yield ASCIIBuffer_ToStr(frame)
+
+def GenerateAnimation_SimulationBased_MatrixRain(data):
+    '''
+    Generate Animation - Simulation Based - Matrix Rain
+    '''
+    # data["width"], data["height"] is the frame size, data["frames"] the frame count (None for endless) and data["seed"] the random seed
+    # data["speedRange"] is the range of drop speeds (rows per frame) and data["trailRange"] of trail lengths (rows)
+    width, height, steps, rng = Simulation_Params(data)
+    fields = SimulationFields_MatrixRain(width, height, steps, rng, data.get("speedRange", (0.3, 1.0)), data.get("trailRange", (4, 16)))
+    return Simulation_Render(fields, data)
+
+def GenerateAnimation_SimulationBased_Starfield(data):
+    '''
+    Generate Animation - Simulation Based - Starfield
+    '''
+    # data["starCount"] is the number of stars and data["speed"] the depth they move per frame (depth goes from 1 to 0)
+    width, height, steps, rng = Simulation_Params(data)
+    fields = SimulationFields_Starfield(width, height, steps, rng, TextEffect_Count(data, "starCount", 200), data.get("speed", 0.02))
+    return Simulation_Render(fields, data)
+
+def GenerateAnimation_SimulationBased_Fire(data):
+    '''
+    Generate Animation - Simulation Based - Fire
+    '''
+    # data["sparkChance"] is the chance of a spark in each column per frame and data["flicker"] the max random cooling per step
+    width, height, steps, rng = Simulation_Params(data)
+    fields = SimulationFields_Fire(width, height, steps, rng, data.get("sparkChance", 0.6), data.get("flicker", 0.15))
+    return Simulation_Render(fields, data)
+
+def RenderASCII_ImageBased_Fill(I, IMAGE_FILL_ASCII, buffer=None, batch=False, dither=None, ditherSize=4, toneCurve=None, valueRange=None):
+    '''
+    Render ASCII - Image Based - Fill - Render into character buffer
+    '''
+    # If batch, I is a (N, H, W) or (N, H, W, 3) stack of frames
+    # dither is one of None, "bayer" (ordered, ditherSize x ditherSize matrix) or "floyd-steinberg" (error diffusion)
+    # toneCurve is a 256 entry uint8 curve, without dithering it is fused into the lookup table so it costs no pixel pass
+    # uint16 and float images are binned directly from their valueRange (see Image_ValueRange) without an 8 bit copy
+    I_g = Image_Gray(I, batch)
+    ASCII_MAP = ASCIIMapLibrary.ASCIIMap_Compile(IMAGE_FILL_ASCII)
+    if dither is not None:
+        I_g = Image_Dither(Image_Tone(Image_To8Bit(I_g, valueRange), toneCurve), ASCII_MAP, dither, ditherSize)
+        buffer = RenderASCII_LookupTable(I_g, ASCII_MAP.lookupTable, buffer)
+    elif I_g.dtype != np.uint8 or valueRange is not None:
+        buffer = RenderASCII_ValueBins(I_g, ASCII_MAP, valueRange, toneCurve, buffer)
+    else:
+        LookupTable = ASCII_MAP.lookupTable if toneCurve is None else ASCII_MAP.lookupTable[toneCurve]
+        buffer = RenderASCII_LookupTable(I_g, LookupTable, buffer)
+    return buffer, I_g
+
+def RenderASCII_ImageBased_Border(I, IMAGE_FILL_ASCII, thresholds=[30, 200], buffer=None, batch=False, toneCurve=None, valueRange=None):
+    '''
+    Render ASCII - Image Based - Border - Render into character buffer
+    '''
+    # If batch, I is a (N, H, W) or (N, H, W, 3) stack of frames
+    # Canny needs 8 bit input, so uint16 and float images are scaled from their valueRange
+    I_g = Image_Tone(Image_To8Bit(Image_Gray(I, batch), valueRange), toneCurve)
+    if batch:
+        I_edge = np.empty(I_g.shape, dtype=np.uint8)
+        for i in range(I_g.shape[0]):
+            cv2.Canny(I_g[i], thresholds[0], thresholds[1], edges=I_edge[i])
+    else:
+        I_edge = cv2.Canny(I_g , thresholds[0], thresholds[1])
+    ASCII_MAP = ASCIIMapLibrary.ASCIIMap_Compile(IMAGE_FILL_ASCII)
+    buffer = RenderASCII_LookupTable(I_edge, ASCII_MAP.lookupTable, buffer)
+    return buffer, I_edge
+
+def RenderASCII_ImageBased_BorderGradient(I, IMAGE_FILL_ASCII, threshold=100, directionChars="|/-\\", buffer=None, batch=False, toneCurve=None, valueRange=None):
+    '''
+    Render ASCII - Image Based - Border Gradient - Render edges as characters along edge direction into character buffer
+    '''
+    # If batch, I is a (N, H, W) or (N, H, W, 3) stack of frames
+    # threshold is in 8 bit units, so uint16 and float images are scaled from their valueRange
+    I_g = Image_Tone(Image_To8Bit(Image_Gray(I, batch), valueRange), toneCurve)
+    ASCII_MAP = ASCIIMapLibrary.ASCIIMap_Compile(IMAGE_FILL_ASCII)
+    DirectionTable = GradientDirection_LookupTable(directionChars, ASCII_MAP["default"]["fillStr"])
+    I_edge = np.empty(I_g.shape, dtype=np.uint8)
+    if buffer is None:
+        buffer = ASCIIBuffer_Create(I_g.shape, DirectionTable.dtype)
+    if batch:
+        for i in range(I_g.shape[0]):
+            I_buckets = GradientDirection_Buckets(I_g[i], threshold, I_edge[i])
+            RenderASCII_LookupTable(I_buckets, DirectionTable, buffer[i])
+    else:
+        I_buckets = GradientDirection_Buckets(I_g, threshold, I_edge)
+        RenderASCII_LookupTable(I_buckets, DirectionTable, buffer)
+    return buffer, I_edge
+
+def RenderASCII_ImageBased_Glyph(I, IMAGE_FILL_ASCII=None, charSet=GLYPH_CHARSET, cellSize=GLYPH_CELL_SIZE, buffer=None, batch=False, toneCurve=None, valueRange=None):
+    '''
+    Render ASCII - Image Based - Glyph - Match each cell of image to the most similar character bitmap into character buffer
+    '''
+    # Each character covers a cellSize (H, W) block of pixels, partial cells at the right and bottom are cropped
+    # IMAGE_FILL_ASCII is only accepted to keep the same interface as the other image styles
+    # If batch, I is a (N, H, W) or (N, H, W, 3) stack of frames
+    I_g = Image_Tone(Image_To8Bit(Image_Gray(I, batch), valueRange), toneCurve)
+    a = 1 if batch else 0
+    glyphMatrix, glyphBias, CodeTable = Glyphs_Matrix(charSet, cellSize)
+    rows, cols = I_g.shape[a] // cellSize[0], I_g.shape[a+1] // cellSize[1]
+    # Split into cells and match all cells with one matrix multiply
+    I_cells = I_g[..., :rows*cellSize[0], :cols*cellSize[1]].reshape(I_g.shape[:a] + (rows, cellSize[0], cols, cellSize[1]))
+    I_cells = np.swapaxes(I_cells, a+1, a+2).reshape(-1, cellSize[0]*cellSize[1]).astype(np.float32) / 255.0
+    matchScores = I_cells @ glyphMatrix
+    matchScores += glyphBias
+    I_glyphs = np.argmax(matchScores, axis=1).astype(np.uint8).reshape(I_g.shape[:a] + (rows, cols))
+    buffer = RenderASCII_LookupTable(I_glyphs, CodeTable, buffer)
+    return buffer, I_g
+
+def RenderASCII_LookupTable(I_vals, LookupTable, buffer=None):
+    '''
+    Render ASCII - Gather character codes of uint8 values from lookup table into character buffer
+    '''
+    if buffer is None:
+        buffer = ASCIIBuffer_Create(I_vals.shape, LookupTable.dtype)
+    else:
+        ASCIIBuffer_Check(buffer, I_vals.shape, LookupTable.dtype)
+    if LookupTable.dtype == np.uint8 and I_vals.dtype == np.uint8 and buffer.dtype == np.uint8 and buffer.flags.c_contiguous and I_vals.size > 0:
+        # Fast path - OpenCV lookup over frame rows directly into the buffer (batches are stacked as rows)
+        cv2.LUT(I_vals.reshape(-1, I_vals.shape[-1]), LookupTable, dst=buffer.reshape(-1, buffer.shape[-1])[:, :-1])
+    else:
+        np.take(LookupTable.astype(buffer.dtype, copy=False), I_vals, out=buffer[..., :-1], mode="clip")
+    return buffer
+
+def ValueBins_Table(ASCII_MAP, valueRange, toneCurve=None):
+    '''
+    Value Bins - Bin edges in image value units and character codes for an image value range
+    '''
+    # Without a tone curve the exact map edges are used, else values are rounded to 8 bit and looked up in the toned table
+    if toneCurve is None:
+        edges, codes = ASCII_MAP.valueEdges, ASCII_MAP.valueCodes
+    else:
+        edges, codes = np.arange(1, ASCIIMapLibrary.ASCII_MAP_VALUES) - 0.5, ASCII_MAP.lookupTable[toneCurve]
+    # Map edges are in 8 bit units where valueRange[1] is 255
+    lo, hi = valueRange
+    return lo + edges * ((hi - lo) / 255.0), codes
+
+def ValueBins_LookupTable(ASCII_MAP, valueRange, toneCurve=None):
+    '''
+    Value Bins - 65536 entry character code lookup table for uint16 images
+    '''
+    key = (ASCII_MAP.hash, tuple(valueRange))
+    if toneCurve is None:
+        with VALUE_LOOKUP_TABLES_LOCK:
+            if key in VALUE_LOOKUP_TABLES.keys():
+                VALUE_LOOKUP_TABLES.move_to_end(key)
+                return VALUE_LOOKUP_TABLES[key]
+    edges, codes = ValueBins_Table(ASCII_MAP, valueRange, toneCurve)
+    LookupTable = codes[np.searchsorted(edges, np.arange(2**16), side="right")]
+    # Tone curves can change every frame, so only untoned tables are cached
+    if toneCurve is None:
+        with VALUE_LOOKUP_TABLES_LOCK:
+            VALUE_LOOKUP_TABLES[key] = LookupTable
+            if len(VALUE_LOOKUP_TABLES) > VALUE_LOOKUP_TABLES_MAX: VALUE_LOOKUP_TABLES.popitem(last=False)
+    return LookupTable
+
+def RenderASCII_ValueBins(I_vals, ASCII_MAP, valueRange=None, toneCurve=None, buffer=None):
+    '''
+    Render ASCII - Bin values of uint16 or float images into character codes into character buffer
+    '''
+    # Rows are processed in chunks of about VALUE_BINS_CHUNK values, so the only temporaries are chunk sized index arrays
+    valueRange = Image_ValueRange(I_vals, valueRange)
+    if buffer is None:
+        buffer = ASCIIBuffer_Create(I_vals.shape, ASCII_MAP.lookupTable.dtype)
+    else:
+        ASCIIBuffer_Check(buffer, I_vals.shape, ASCII_MAP.lookupTable.dtype)
+    if I_vals.size == 0: return buffer
+    vals = I_vals.reshape(-1, I_vals.shape[-1])
+    codesOut = buffer.reshape(-1, buffer.shape[-1])[:, :-1]
+    chunkRows = max(1, VALUE_BINS_CHUNK // vals.shape[1])
+    if I_vals.dtype in (np.uint8, np.uint16):
+        LookupTable = ValueBins_LookupTable(ASCII_MAP, valueRange, toneCurve).astype(buffer.dtype, copy=False)
+        for i in range(0, vals.shape[0], chunkRows):
+            np.take(LookupTable, vals[i:i+chunkRows], out=codesOut[i:i+chunkRows])
+    else:
+        edges, codes = ValueBins_Table(ASCII_MAP, valueRange, toneCurve)
+        codes = codes.astype(buffer.dtype, copy=False)
+        binIndices = np.empty((chunkRows, vals.shape[1]), dtype=np.uint8 if edges.shape[0] < 256 else np.intp)
+        binMask = np.empty((chunkRows, vals.shape[1]), dtype=bool)
+        for i in range(0, vals.shape[0], chunkRows):
+            valsChunk = vals[i:i+chunkRows]
+            n = valsChunk.shape[0]
+            # Counting edges below each value is faster than a binary search for the few edges of usual maps
+            if edges.shape[0] <= VALUE_BINS_COMPARE_EDGES:
+                binIndices[:n] = 0
+                for e in edges:
+                    np.greater_equal(valsChunk, e, out=binMask[:n])
+                    binIndices[:n] += binMask[:n]
+            else:
+                binIndices[:n] = np.searchsorted(edges, valsChunk, side="right")
+            np.take(codes, binIndices[:n], out=codesOut[i:i+chunkRows])
+    return buffer
+
+def GenerateASCII_ImageBased_Fill(I, IMAGE_FILL_ASCII, batch=False, dither=None, ditherSize=4, toneCurve=None, valueRange=None):
     '''
     Generate ASCII - Image Based - Fill
     '''
-    I_g = cv2.cvtColor(I, cv2.COLOR_RGB2GRAY) if I.ndim == 3 else I
-    asciiArray = np.array([[IMAGE_FILL_ASCII["default"]["fillStr"]]*I_g.shape[1]]*I_g.shape[0])
-    for fillVals in IMAGE_FILL_ASCII["map"]:
-        I_mask = (I_g >= fillVals["valRange"][0]) * (I_g < fillVals["valRange"][1])
-        asciiArray[I_mask] = fillVals["fillStr"]
-    asciiData = "\n".join(["".join(list(row)) for row in asciiArray])
+    # If batch, returns list of N frames
+    buffer, I_g = RenderASCII_ImageBased_Fill(I, IMAGE_FILL_ASCII, batch=batch, dither=dither, ditherSize=ditherSize, toneCurve=toneCurve, valueRange=valueRange)
+    asciiData = ASCIIBuffer_ToFrames(buffer) if batch else ASCIIBuffer_ToStr(buffer)
     return asciiData, I_g
 
-def GenerateASCII_ImageBased_Border(I, IMAGE_FILL_ASCII, thresholds=[30, 200]):
+def GenerateASCII_ImageBased_Border(I, IMAGE_FILL_ASCII, thresholds=[30, 200], batch=False, toneCurve=None, valueRange=None):
     '''
     Generate ASCII - Image Based - Border
     '''
-    I_g = cv2.cvtColor(I, cv2.COLOR_RGB2GRAY) if I.ndim == 3 else I
-    I_edge = cv2.Canny(I_g , thresholds[0], thresholds[1])
-    asciiArray = np.array([[IMAGE_FILL_ASCII["default"]["fillStr"]]*I_g.shape[1]]*I_g.shape[0])
-    for fillVals in IMAGE_FILL_ASCII["map"]:
-        I_mask = (I_edge >= fillVals["valRange"][0]) * (I_edge < fillVals["valRange"][1])
-        asciiArray[I_mask] = fillVals["fillStr"]
-    asciiData = "\n".join(["".join(list(row)) for row in asciiArray])
+    # If batch, returns list of N frames
+    buffer, I_edge = RenderASCII_ImageBased_Border(I, IMAGE_FILL_ASCII, thresholds, batch=batch, toneCurve=toneCurve, valueRange=valueRange)
+    asciiData = ASCIIBuffer_ToFrames(buffer) if batch else ASCIIBuffer_ToStr(buffer)
+    return asciiData, I_edge
+
+def GenerateASCII_ImageBased_BorderGradient(I, IMAGE_FILL_ASCII, threshold=100, directionChars="|/-\\", batch=False, toneCurve=None, valueRange=None):
+    '''
+    Generate ASCII - Image Based - Border Gradient
+    '''
+    # If batch, returns list of N frames
+    buffer, I_edge = RenderASCII_ImageBased_BorderGradient(I, IMAGE_FILL_ASCII, threshold, directionChars, batch=batch, toneCurve=toneCurve, valueRange=valueRange)
+    asciiData = ASCIIBuffer_ToFrames(buffer) if batch else ASCIIBuffer_ToStr(buffer)
     return asciiData, I_edge
 
+def GenerateASCII_ImageBased_Glyph(I, IMAGE_FILL_ASCII=None, charSet=GLYPH_CHARSET, cellSize=GLYPH_CELL_SIZE, batch=False, toneCurve=None, valueRange=None):
+    '''
+    Generate ASCII - Image Based - Glyph
+    '''
+    # If batch, returns list of N frames
+    buffer, I_g = RenderASCII_ImageBased_Glyph(I, IMAGE_FILL_ASCII, charSet, cellSize, batch=batch, toneCurve=toneCurve, valueRange=valueRange)
+    asciiData = ASCIIBuffer_ToFrames(buffer) if batch else ASCIIBuffer_ToStr(buffer)
+    return asciiData, I_g
+
 # Run Code
 # # Params
 # imgPath = "Data/TestImgs/Test.jpg"
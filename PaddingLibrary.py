@@ -3,7 +3,126 @@ Padding Library for ascii animation padding functions
 """
 
 # Imports
+import functools
+import threading
+import collections
+import numpy as np
 
+# Main Vars
+PADDING_TEMPLATES_MAX = 64
+
+# Util Vars
+# Least recently used templates are evicted, so long running apps do not keep every size seen
+# Templates are shared by all threads (app sessions), so the cache is guarded by a lock and templates are never written after creation
+PADDING_TEMPLATES = collections.OrderedDict()
+PADDING_TEMPLATES_LOCK = threading.Lock()
+
+# Utils Functions
+def Text_Dims(text):
+    '''
+    Text - Dims [width, height] of text and its lines if they are not all of equal width (else None)
+    '''
+    textHeight = text.count("\n") + 1
+    textWidth = text.find("\n")
+    if textWidth == -1: textWidth = len(text)
+    # Rectangular text has a newline after every textWidth characters
+    if len(text) == textHeight*(textWidth+1) - 1 and text[textWidth::textWidth+1] == "\n"*(textHeight-1):
+        return (textWidth, textHeight), None
+    textLines = text.split("\n")
+    return (max(map(len, textLines)), textHeight), textLines
+
+def PaddingTemplate_Create(topLines, left, right, bottomLines):
+    '''
+    Padding Template - Create template of pad lines above and below and pad strings left and right of each text line
+    '''
+    # A padded rectangular text is prefix + text with each newline replaced by sep + suffix
+    template = {
+        "topLines": topLines,
+        "bottomLines": bottomLines,
+        "left": left,
+        "right": right,
+        "prefix": "".join([l + "\n" for l in topLines]) + left,
+        "sep": right + "\n" + left,
+        "suffix": right + "".join(["\n" + l for l in bottomLines]),
+        "grid": None
+    }
+    return template
+
+def PaddingTemplate_Get(key, TemplateFunc):
+    '''
+    Padding Template - Get template for key (padding params and text dims), created by TemplateFunc if not cached
+    '''
+    with PADDING_TEMPLATES_LOCK:
+        if key in PADDING_TEMPLATES.keys():
+            PADDING_TEMPLATES.move_to_end(key)
+        else:
+            PADDING_TEMPLATES[key] = TemplateFunc()
+            if len(PADDING_TEMPLATES) > PADDING_TEMPLATES_MAX: PADDING_TEMPLATES.popitem(last=False)
+        return PADDING_TEMPLATES[key]
+
+def PaddingTemplate_SimpleStrRepeat(textDims, padStr="o", X_count=1, Y_count=1):
+    '''
+    Padding Template - Simple String Repeat
+    '''
+    def TemplateFunc():
+        padLenMid_X = [int(textDims[0]/len(padStr)), textDims[0]%len(padStr)]
+        pad_X = [padStr*X_count, (padStr*padLenMid_X[0]) + padStr[:padLenMid_X[1]], padStr*X_count]
+        padLine = "".join(pad_X)
+        return PaddingTemplate_Create([padLine]*Y_count, padStr*X_count, padStr*X_count, [padLine]*Y_count)
+    return PaddingTemplate_Get(("SimpleStrRepeat", tuple(textDims), padStr, X_count, Y_count), TemplateFunc)
+
+def PaddingTemplate_FramePad(textDims):
+    '''
+    Padding Template - Frame Pad
+    '''
+    def TemplateFunc():
+        padLine_Top = "".join([".", "-"*(textDims[0]), "."])
+        padLine_Bottom = "".join(["L", "-"*(textDims[0]), "⅃"])
+        return PaddingTemplate_Create([padLine_Top], "|", "|", [padLine_Bottom])
+    return PaddingTemplate_Get(("FramePad", tuple(textDims)), TemplateFunc)
+
+def PaddingTemplate_Grid(template, textDims):
+    '''
+    Padding Template - Read only blank character grid (with newline column) of padded frame
+    '''
+    # Blank grid is built once per template and only copied from, so it can be shared between threads
+    if template["grid"] is None:
+        lines = template["topLines"] + [template["left"] + " "*textDims[0] + template["right"]]*textDims[1] + template["bottomLines"]
+        grid = np.frombuffer(("\n".join(lines) + "\n").encode("utf-32-le"), dtype="<u4").reshape(len(lines), -1)
+        if grid.max() < 256: grid = grid.astype(np.uint8)
+        grid.flags.writeable = False
+        template["grid"] = grid
+    return template["grid"]
+
+def Padding_ApplyTemplate(text, TemplateFunc):
+    '''
+    Padding - Pad text with template of its dims
+    '''
+    textDims, textLines = Text_Dims(text)
+    template = TemplateFunc(textDims)
+    # Ragged lines are filled to the max line width with spaces
+    if textLines is not None:
+        text = "\n".join([l.ljust(textDims[0]) for l in textLines])
+    return template["prefix"] + text.replace("\n", template["sep"]) + template["suffix"]
+
+def Padding_ApplyTemplate_Buffer(buffer, TemplateFunc, batch=False, out=None):
+    '''
+    Padding - Pad character buffer (or batch of buffers) with template of its dims into a new padded buffer (or into out)
+    '''
+    # out can be reused by the caller for frames of the same dims, it must be able to hold the codes of buffer and template
+    textDims = (buffer.shape[-1]-1, buffer.shape[-2])
+    template = TemplateFunc(textDims)
+    grid = PaddingTemplate_Grid(template, textDims)
+    shape = ((buffer.shape[0],) if batch else ()) + grid.shape
+    dtype = grid.dtype if grid.dtype.itemsize >= buffer.dtype.itemsize else buffer.dtype
+    if out is None:
+        out = np.empty(shape, dtype=dtype)
+    elif out.shape != shape or out.dtype.itemsize < np.dtype(dtype).itemsize:
+        raise ValueError("Padded buffer shape " + str(out.shape) + " and dtype " + str(out.dtype) + " cannot hold padded frames of shape " + str(shape) + " and dtype " + str(np.dtype(dtype)))
+    out[...] = grid
+    top, left = len(template["topLines"]), len(template["left"])
+    out[..., top:top+textDims[1], left:left+textDims[0]] = buffer[..., :-1]
+    return out
 
 # Main Functions
 def Padding_SimpleStrRepeat(textList, padStr="o", X_count=1, Y_count=1):
@@ -15,27 +134,8 @@ def Padding_SimpleStrRepeat(textList, padStr="o", X_count=1, Y_count=1):
     # -0-       =>  Padding 1, 1
     # ---
 
-    Counts = [X_count, Y_count]
-
-    processedList = []
-    for text in textList:
-        textLines = text.split("\n")
-        lineLens = list(map(len, textLines))
-        textDims = [max(lineLens), len(textLines)]
-        
-        padLenMid_X = [int(textDims[0]/len(padStr)), textDims[0]%len(padStr)]
-        pad_X = [padStr*Counts[0], (padStr*padLenMid_X[0]) + padStr[:padLenMid_X[1]], padStr*Counts[0]]
-        padLine = "".join(pad_X)
-        
-        paddedLines = []
-        paddedLines = paddedLines + [padLine]*Counts[1]
-        for l in textLines:
-            textLineMatchPadCount = textDims[0] - len(l)
-            pad_L = [padStr*Counts[0], l + " "*(textLineMatchPadCount), padStr*Counts[0]]
-            textLine = "".join(pad_L)
-            paddedLines.append(textLine)
-        paddedLines = paddedLines + [padLine]*Counts[1]
-        processedList.append("\n".join(paddedLines))
+    TemplateFunc = functools.partial(PaddingTemplate_SimpleStrRepeat, padStr=padStr, X_count=X_count, Y_count=Y_count)
+    processedList = [Padding_ApplyTemplate(text, TemplateFunc) for text in textList]
 
     return processedList
 
@@ -50,27 +150,21 @@ def Padding_FramePad(textList):
     # |000|
     # L---⅃
 
-    processedList = []
-    for text in textList:
-        textLines = text.split("\n")
-        lineLens = list(map(len, textLines))
-        textDims = [max(lineLens), len(textLines)]
-        
-        pad_X_Top = [".", "-"*(textDims[0]), "."]
-        padLine_Top = "".join(pad_X_Top)
-        pad_X_Bottom = ["L", "-"*(textDims[0]), "⅃"]
-        padLine_Bottom = "".join(pad_X_Bottom)
-        
-        paddedLines = []
-        paddedLines = [padLine_Top] + paddedLines
-        for l in textLines:
-            textLineMatchPadCount = textDims[0] - len(l)
-            pad_L = ["|", l + " "*(textLineMatchPadCount), "|"]
-            textLine = "".join(pad_L)
-            paddedLines.append(textLine)
-        paddedLines = paddedLines + [padLine_Bottom]
-        processedList.append("\n".join(paddedLines))
+    processedList = [Padding_ApplyTemplate(text, PaddingTemplate_FramePad) for text in textList]
 
     return processedList
 
+def Padding_SimpleStrRepeat_Buffer(buffer, padStr="o", X_count=1, Y_count=1, batch=False, out=None):
+    '''
+    Padding - Simple String Repeat - Character buffer (or batch of buffers)
+    '''
+    TemplateFunc = functools.partial(PaddingTemplate_SimpleStrRepeat, padStr=padStr, X_count=X_count, Y_count=Y_count)
+    return Padding_ApplyTemplate_Buffer(buffer, TemplateFunc, batch, out)
+
+def Padding_FramePad_Buffer(buffer, batch=False, out=None):
+    '''
+    Padding - Frame Pad - Character buffer (or batch of buffers)
+    '''
+    return Padding_ApplyTemplate_Buffer(buffer, PaddingTemplate_FramePad, batch, out)
+
 # Run Code
@@ -0,0 +1,125 @@
+"""
+Tone Library for tone curves that are fused into image ascii lookup tables
+"""
+
+# Imports
+import numpy as np
+
+import GeneratorLibrary
+
+# Main Vars
+TONE_CONTRAST_MODES = ["none", "auto-contrast", "equalize"]
+TONE_HIST_STEP = 4
+
+# Util Vars
+TONE_IDENTITY = np.arange(256, dtype=np.uint8)
+
+# Utils Functions
+def ToneCurve_Invert():
+    '''
+    Tone Curve - Invert values
+    '''
+    return TONE_IDENTITY[::-1].copy()
+
+def ToneCurve_Gamma(gamma=1.0):
+    '''
+    Tone Curve - Gamma correction (gamma < 1 brightens, gamma > 1 darkens)
+    '''
+    return np.rint(255.0 * (TONE_IDENTITY / 255.0) ** gamma).astype(np.uint8)
+
+def ToneCurve_AutoContrast(hist, clipPercent=0.5):
+    '''
+    Tone Curve - Stretch values between low and high percentiles of histogram to full range
+    '''
+    cdf = np.cumsum(hist, dtype=np.float64)
+    if cdf[-1] <= 0: return TONE_IDENTITY.copy()
+    clip = cdf[-1] * clipPercent / 100.0
+    low = int(np.searchsorted(cdf, clip, side="right"))
+    high = int(np.searchsorted(cdf, cdf[-1] - clip, side="left"))
+    if high <= low: return TONE_IDENTITY.copy()
+    curve = (TONE_IDENTITY.astype(np.float64) - low) * (255.0 / (high - low))
+    return np.rint(np.clip(curve, 0, 255)).astype(np.uint8)
+
+def ToneCurve_Equalize(hist):
+    '''
+    Tone Curve - Histogram equalization
+    '''
+    cdf = np.cumsum(hist, dtype=np.float64)
+    cdfMin = cdf[np.flatnonzero(hist)[0]] if np.any(hist > 0) else 0.0
+    if cdf[-1] - cdfMin <= 0: return TONE_IDENTITY.copy()
+    curve = (cdf - cdfMin) * (255.0 / (cdf[-1] - cdfMin))
+    return np.rint(np.clip(curve, 0, 255)).astype(np.uint8)
+
+def ToneCurve_Compose(*curves):
+    '''
+    Tone Curve - Compose curves applied in given order into one curve
+    '''
+    curve = TONE_IDENTITY.copy()
+    for c in curves:
+        curve = c[curve]
+    return curve
+
+def ToneHistogram(I, batch=False, step=TONE_HIST_STEP, valueRange=None):
+    '''
+    Tone Histogram - 256 bin gray histogram of image (or batch of images) sampled every step pixels
+    '''
+    # uint16 and float images are binned in 8 bit units of their valueRange, same as the tone curve
+    a = 1 if batch else 0
+    I_sample = np.ascontiguousarray(I[(slice(None),)*a + (slice(None, None, step), slice(None, None, step))])
+    I_g = GeneratorLibrary.Image_To8Bit(GeneratorLibrary.Image_Gray(I_sample, batch), valueRange)
+    return np.bincount(I_g.reshape(-1), minlength=256).astype(np.float64)
+
+# Main Classes
+class ToneMapper:
+    '''
+    Tone Mapper - Tone curve for video, updated from a running histogram with exponential temporal smoothing
+    '''
+    def __init__(self, invert=False, gamma=1.0, contrast="none", clipPercent=0.5, smoothing=0.9, valueRange=None):
+        self.params = {"invert": invert, "gamma": gamma, "contrast": contrast, "clipPercent": clipPercent}
+        self.smoothing = smoothing
+        self.valueRange = valueRange
+        self.hist = None
+        self.curve = ToneCurve_Build(None, **self.params)
+
+    def Update(self, I, batch=False):
+        '''
+        Tone Mapper - Update running histogram with a frame (or batch of frames) and return current tone curve (None if identity)
+        '''
+        # Curves without a histogram based contrast stage do not depend on frames
+        if self.params["contrast"] == "none": return self.curve
+        hist = ToneHistogram(I, batch, valueRange=self.valueRange)
+        hist /= max(1.0, hist.sum())
+        if self.hist is None:
+            self.hist = hist
+        else:
+            # A batch of n frames counts as n smoothing steps
+            keep = self.smoothing ** (I.shape[0] if batch else 1)
+            self.hist = keep * self.hist + (1.0 - keep) * hist
+        self.curve = ToneCurve_Build(self.hist, **self.params)
+        return self.curve
+
+# Main Functions
+def ToneCurve_Build(hist=None, invert=False, gamma=1.0, contrast="none", clipPercent=0.5):
+    '''
+    Tone Curve - Build curve of contrast stage (from histogram), gamma and invert applied in that order, None if it is the identity
+    '''
+    # Contrast stage is skipped until a histogram is available
+    # Renderers skip tone mapping for a None curve, which keeps their untoned fast paths (and cached tables)
+    if contrast not in TONE_CONTRAST_MODES:
+        raise ValueError("Unknown tone contrast mode " + repr(contrast) + ", expected one of " + str(TONE_CONTRAST_MODES))
+    curves = []
+    if hist is not None:
+        if contrast == "auto-contrast": curves.append(ToneCurve_AutoContrast(hist, clipPercent))
+        elif contrast == "equalize": curves.append(ToneCurve_Equalize(hist))
+    if gamma != 1.0: curves.append(ToneCurve_Gamma(gamma))
+    if invert: curves.append(ToneCurve_Invert())
+    curve = ToneCurve_Compose(*curves)
+    if np.array_equal(curve, TONE_IDENTITY): return None
+    return curve
+
+def ToneCurve_FromImage(I, batch=False, invert=False, gamma=1.0, contrast="none", clipPercent=0.5, valueRange=None):
+    '''
+    Tone Curve - Build curve for an image (or batch of images)
+    '''
+    hist = None if contrast == "none" else ToneHistogram(I, batch, valueRange=valueRange)
+    return ToneCurve_Build(hist, invert, gamma, contrast, clipPercent)
@@ -0,0 +1,130 @@
+"""
+Library for basic image functions
+"""
+
+# Imports
+import os
+import cv2
+import mmap
+import numpy as np
+
+# Main Vars
+CHAR_ASPECT_RATIO = 2.0
+TILED_BAND_BYTES = 2**26
+
+# Utils Functions
+def CellCount_Rows(imgSize, cols, charAspect=CHAR_ASPECT_RATIO):
+    '''
+    Cell Count - Number of character rows for given image size (H, W), character columns and character aspect ratio (height / width)
+    '''
+    rows = int(round(cols * (imgSize[0] / imgSize[1]) / charAspect))
+    return min(imgSize[0], max(1, rows))
+
+def CellEdges(size, count):
+    '''
+    Cell Edges - Integer pixel edges splitting size pixels into count nearly equal cells
+    '''
+    return (np.arange(count+1) * size) // count
+
+def CellSum_Dtype(dtype, cellPixels):
+    '''
+    Cell Sum - Accumulator dtype that can hold sums of given number of pixels of given dtype without overflow
+    '''
+    if not np.issubdtype(dtype, np.integer): return np.float64
+    # Signed sums can be negative, so they are only accumulated in a signed type
+    if np.dtype(dtype).kind == "i": return np.int64
+    maxSum = int(np.iinfo(dtype).max) * int(cellPixels)
+    return np.uint32 if maxSum < 2**32 else np.uint64
+
+def CellEdges_Uniform(edges):
+    '''
+    Cell Edges - Check if all cells between edges have equal size
+    '''
+    sizes = np.diff(edges)
+    return bool(np.all(sizes == sizes[0]))
+
+def ImageSource_Open(path, rawShape=None, rawDtype=np.uint8):
+    '''
+    Image Source - Open image as an array, memory mapped for .npy files and raw files of given shape (H, W[, C])
+    '''
+    # Memory mapped sources are only read from disk when rows are accessed
+    if os.path.splitext(path)[-1].lower() == ".npy":
+        return np.load(path, mmap_mode="r")
+    if rawShape is not None:
+        return np.memmap(path, dtype=rawDtype, mode="r", shape=tuple(rawShape))
+    # Encoded images can only be decoded whole
+    I = cv2.imread(path, cv2.IMREAD_UNCHANGED)
+    if I is None:
+        raise ValueError("Could not read image " + repr(path))
+    if I.ndim == 3:
+        I = cv2.cvtColor(I, cv2.COLOR_BGRA2RGB if I.shape[2] == 4 else cv2.COLOR_BGR2RGB)
+    return I
+
+def ImageSource_Release(I):
+    '''
+    Image Source - Drop already read pages of a memory mapped source from process memory (they stay in the OS file cache)
+    '''
+    mm = getattr(I, "_mmap", None)
+    if mm is not None and hasattr(mm, "madvise") and hasattr(mmap, "MADV_DONTNEED"):
+        mm.madvise(mmap.MADV_DONTNEED)
+
+def CellRows_Bands(rowEdges, rowBytes, bandBytes=TILED_BAND_BYTES):
+    '''
+    Cell Rows - Split cell rows into bands [start, end) of whole cell rows each spanning at most bandBytes of source rows
+    '''
+    # A band always has at least one cell row, even if that cell row alone is larger than bandBytes
+    maxBandRows = max(1, bandBytes // max(1, rowBytes))
+    bands = []
+    start = 0
+    count = len(rowEdges) - 1
+    while start < count:
+        end = int(np.searchsorted(rowEdges, rowEdges[start] + maxBandRows, side="right")) - 1
+        end = min(count, max(start + 1, end))
+        bands.append((start, end))
+        start = end
+    return bands
+
+# Main Functions
+def ResizeImage_CellEdges(I, rowEdges, colEdges, batch=False):
+    '''
+    Resize Image - Downsample to one pixel per cell using exact means of cells between given pixel edges
+    '''
+    # If batch, I is a (N, H, W) or (N, H, W, C) stack of frames
+    # Edges must be increasing and may start after 0 (cells outside the edges are ignored)
+    a = 1 if batch else 0
+    pre = (slice(None),) * a
+    rows, cols = len(rowEdges) - 1, len(colEdges) - 1
+    I = I[pre + (slice(rowEdges[0], rowEdges[-1]), slice(colEdges[0], colEdges[-1]))]
+    rowEdges, colEdges = np.asarray(rowEdges) - rowEdges[0], np.asarray(colEdges) - colEdges[0]
+    accDtype = CellSum_Dtype(I.dtype, int(np.max(np.diff(rowEdges))) * int(np.max(np.diff(colEdges))))
+
+    # Sum rows of each cell - reshape into equal cells if possible, else one contiguous block sum per cell row
+    if CellEdges_Uniform(rowEdges):
+        I_sums = I.reshape(I.shape[:a] + (rows, rowEdges[1]) + I.shape[a+1:]).sum(axis=a+1, dtype=accDtype)
+    else:
+        I_sums = np.empty(I.shape[:a] + (rows,) + I.shape[a+1:], dtype=accDtype)
+        for i in range(rows):
+            np.sum(I[pre + (slice(rowEdges[i], rowEdges[i+1]),)], axis=a, dtype=accDtype, out=I_sums[pre + (i,)])
+    # Sum columns of each cell on the row summed image
+    if CellEdges_Uniform(colEdges):
+        I_sums = I_sums.reshape(I_sums.shape[:a+1] + (cols, colEdges[1]) + I_sums.shape[a+2:]).sum(axis=a+2)
+    else:
+        I_sums = np.add.reduceat(I_sums, colEdges[:-1], axis=a+1)
+    # Divide by cell areas
+    cellAreas = np.outer(np.diff(rowEdges), np.diff(colEdges)).reshape((rows, cols) + (1,)*(I.ndim-a-2))
+    I_cells = I_sums / cellAreas
+
+    if np.issubdtype(I.dtype, np.integer):
+        I_cells = np.rint(I_cells)
+    return I_cells.astype(I.dtype)
+
+def ResizeImage_CellMean(I, cols, charAspect=CHAR_ASPECT_RATIO, batch=False):
+    '''
+    Resize Image - Downsample to one pixel per character cell using exact per cell means
+    '''
+    # If batch, I is a (N, H, W) or (N, H, W, C) stack of frames
+    a = 1 if batch else 0
+    imgSize = I.shape[a:a+2]
+    cols = min(imgSize[1], max(1, int(cols)))
+    rows = CellCount_Rows(imgSize, cols, charAspect)
+    return ResizeImage_CellEdges(I, CellEdges(imgSize[0], rows), CellEdges(imgSize[1], cols), batch)
@@ -130,19 +130,35 @@ def DisplayVideo(vid=None, path=None, max_frames=-1, EffectFunc=None):
 
     cv2.destroyAllWindows()
 
-def VideoEffect_FFMPEG(pathIn, pathOut, EffectFunc, max_frames=-1, speedUp=1, fps=20.0, size=None, use_stqdm=False):
+def ApplyEffect_Frames(frames, EffectFunc, batchSize=1, use_stqdm=False):
     '''
-    Video Effect - FFMPEG
+    Apply Effect - Frames
     '''
+    # If batchSize > 1, EffectFunc is given (N, H, W, C) stacks of frames and returns stacks of frames
     TQDM = stqdm if use_stqdm else tqdm
 
+    frames_effect = []
+    if batchSize > 1:
+        for i in TQDM(range(0, len(frames), batchSize)):
+            framesBatch = EffectFunc(np.stack(frames[i:i+batchSize]))
+            for frame in framesBatch:
+                frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+                frames_effect.append(Image.fromarray(frame))
+    else:
+        for frame in TQDM(frames):
+            frame = cv2.cvtColor(EffectFunc(frame), cv2.COLOR_BGR2RGB)
+            frames_effect.append(Image.fromarray(frame))
+
+    return frames_effect
+
+def VideoEffect_FFMPEG(pathIn, pathOut, EffectFunc, max_frames=-1, speedUp=1, fps=20.0, size=None, use_stqdm=False, batchSize=1):
+    '''
+    Video Effect - FFMPEG
+    '''
     frames = GetFramesFromVideo(path=pathIn, max_frames=max_frames)
     frames = frames[::int(speedUp)]
 
-    frames_effect = []
-    for frame in TQDM(frames):
-        frame = cv2.cvtColor(EffectFunc(frame), cv2.COLOR_BGR2RGB)
-        frames_effect.append(Image.fromarray(frame))
+    frames_effect = ApplyEffect_Frames(frames, EffectFunc, batchSize, use_stqdm)
 
     if size is None:
         size = (640, 480)
@@ -159,20 +175,15 @@ def VideoEffect_FFMPEG(pathIn, pathOut, EffectFunc, max_frames=-1, speedUp=1, fp
             out.write(frame)
         out.release()
 
-def VideoEffect(pathIn, pathOut, EffectFunc, max_frames=-1, speedUp=1, fps=24.0, size=None, use_stqdm=False):
+def VideoEffect(pathIn, pathOut, EffectFunc, max_frames=-1, speedUp=1, fps=24.0, size=None, use_stqdm=False, batchSize=1):
     '''
     Video Effect
     '''
-    TQDM = stqdm if use_stqdm else tqdm
-
     frames = GetFramesFromVideo(path=pathIn, max_frames=max_frames)
     frames = frames[::int(speedUp)]
     frame_duration = 1.0 / fps
 
-    frames_effect = []
-    for frame in TQDM(frames):
-        frame = cv2.cvtColor(EffectFunc(frame), cv2.COLOR_BGR2RGB)
-        frames_effect.append(Image.fromarray(frame))
+    frames_effect = ApplyEffect_Frames(frames, EffectFunc, batchSize, use_stqdm)
 
     FRAMES = []
     # Create Image Clips
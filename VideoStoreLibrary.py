@@ -0,0 +1,196 @@
+"""
+Video Store Library for memory mapped ascii video files with fixed size frames
+"""
+
+# Imports
+import json
+import struct
+import numpy as np
+
+# Main Vars
+VIDEOSTORE_EXT = ".asciivid"
+VIDEOSTORE_MAGIC = b"ASCIIVID"
+VIDEOSTORE_VERSION = 1
+VIDEOSTORE_DATA_OFFSET = 4096
+
+# Util Vars
+VIDEOSTORE_LATIN1 = "".join([chr(c) for c in range(256)])
+# Byte codes of control characters never produced by renderers, reused for characters outside latin-1
+VIDEOSTORE_FREE_CODES = [c for c in list(range(1, 32)) + list(range(127, 160)) if c not in [9, 10, 13]]
+
+# Utils Functions
+def VideoStore_Charset(extraChars="", charset=VIDEOSTORE_LATIN1):
+    '''
+    Video Store - Charset of 256 characters (one per byte code), latin-1 with extra characters in unused control codes
+    '''
+    # Latin-1 characters keep their own byte code, so uint8 character buffers are stored as they are
+    charset = list(charset)
+    extraChars = [c for c in dict.fromkeys(extraChars) if ord(c) > 255 and c not in charset]
+    freeCodes = [code for code in VIDEOSTORE_FREE_CODES if charset[code] == chr(code)]
+    if len(extraChars) > len(freeCodes):
+        raise ValueError("Too many characters outside latin-1 for a video store charset (max " + str(len(VIDEOSTORE_FREE_CODES)) + ")")
+    for code, c in zip(freeCodes, extraChars):
+        charset[code] = c
+    return "".join(charset)
+
+def Charset_Codes(charset):
+    '''
+    Charset - Character codes of charset indexed by byte code
+    '''
+    if len(charset) != 256:
+        raise ValueError("Video store charset must have 256 characters, got " + str(len(charset)))
+    return np.frombuffer(charset.encode("utf-32-le"), dtype="<u4")
+
+# Main Classes
+class VideoStoreWriter:
+    '''
+    Video Store Writer - Append character buffers of frames to a video store file
+    '''
+    def __init__(self, path, height, width, fps=30.0, charset=None, name="Video"):
+        # Frames are height x (width+1) bytes, the last column of each row is the newline
+        # If charset is None, it starts as latin-1 and characters outside latin-1 are given free codes as they are written
+        self.path = path
+        self.shape = (int(height), int(width)+1)
+        self.autoCharset = charset is None
+        self.frameCount = 0
+        self.header = {
+            "version": VIDEOSTORE_VERSION,
+            "name": name,
+            "height": self.shape[0],
+            "width": self.shape[1]-1,
+            "fps": float(fps),
+            "charset": VIDEOSTORE_LATIN1 if charset is None else charset
+        }
+        self.file = open(path, "wb")
+        self.SetCharset(self.header["charset"])
+
+    def SetCharset(self, charset):
+        '''
+        Video Store Writer - Set charset and rewrite header in place
+        '''
+        self.charsetCodes = Charset_Codes(charset)
+        # Characters of charset not at their own latin-1 code, which need remapping when written
+        self.remapCodes = [(int(self.charsetCodes[b]), b) for b in range(256) if self.charsetCodes[b] != b]
+        self.header["charset"] = charset
+        # Header JSON is padded to a fixed size, so it can be rewritten without moving the frames
+        header = json.dumps(self.header).encode("utf-8")
+        headerCapacity = VIDEOSTORE_DATA_OFFSET - len(VIDEOSTORE_MAGIC) - 4
+        if len(header) > headerCapacity:
+            raise ValueError("Video store header is larger than " + str(headerCapacity) + " bytes")
+        position = max(self.file.tell(), VIDEOSTORE_DATA_OFFSET)
+        self.file.seek(0)
+        self.file.write(VIDEOSTORE_MAGIC + struct.pack("<I", headerCapacity) + header + b" " * (headerCapacity - len(header)))
+        self.file.seek(position)
+
+    def Encode(self, buffer):
+        '''
+        Video Store Writer - Byte codes of character buffer
+        '''
+        if buffer.dtype == np.uint8 and len(self.remapCodes) == 0: return buffer
+        codes = buffer.astype(np.uint32)
+        if self.autoCharset:
+            newChars = "".join([chr(c) for c in np.unique(codes[codes > 255]) if c not in self.charsetCodes])
+            if len(newChars) > 0: self.SetCharset(VideoStore_Charset(newChars, self.header["charset"]))
+        out = codes.astype(np.uint8)
+        for code, b in self.remapCodes:
+            out[codes == code] = b
+        # Every character must now be at its charset byte code
+        if not np.array_equal(self.charsetCodes[out], codes):
+            raise ValueError("Frame has characters that are not in the video store charset")
+        return out
+
+    def Write(self, buffer, batch=False):
+        '''
+        Video Store Writer - Append character buffer of a frame (or batch of frames)
+        '''
+        frameShape = buffer.shape[1:] if batch else buffer.shape
+        if tuple(frameShape) != self.shape:
+            raise ValueError("Frame buffer shape " + str(tuple(frameShape)) + " does not match video store frame shape " + str(self.shape))
+        self.file.write(np.ascontiguousarray(self.Encode(buffer)).tobytes())
+        self.frameCount += buffer.shape[0] if batch else 1
+
+    def Close(self):
+        '''
+        Video Store Writer - Close file
+        '''
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.Close()
+
+class VideoStore:
+    '''
+    Video Store - Memory mapped frames of a video store file, read from disk only when accessed
+    '''
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            magic = f.read(len(VIDEOSTORE_MAGIC))
+            if magic != VIDEOSTORE_MAGIC:
+                raise ValueError("Not an ascii video store file " + repr(path))
+            headerLen = struct.unpack("<I", f.read(4))[0]
+            header = f.read(headerLen)
+        self.path = path
+        self.header = json.loads(header.decode("utf-8"))
+        self.name = self.header["name"]
+        self.fps = self.header["fps"]
+        self.charset = self.header["charset"]
+        self.charsetCodes = Charset_Codes(self.charset)
+        self.latin1 = self.charset == VIDEOSTORE_LATIN1
+        self.shape = (self.header["height"], self.header["width"]+1)
+        # Frame count comes from the file size, so frames appended by a writer are seen by new readers
+        dataOffset = len(VIDEOSTORE_MAGIC) + 4 + headerLen
+        frameBytes = self.shape[0] * self.shape[1]
+        fileData = np.memmap(path, dtype=np.uint8, mode="r")
+        frameCount = (fileData.shape[0] - dataOffset) // frameBytes if frameBytes > 0 else 0
+        self.frames = fileData[dataOffset:dataOffset+frameCount*frameBytes].reshape((frameCount,) + self.shape)
+
+    def Buffer(self, index):
+        '''
+        Video Store - Byte code buffer of frame (zero copy view of the file)
+        '''
+        return self.frames[index]
+
+    def Text(self, buffer):
+        '''
+        Video Store - Text of a byte code buffer
+        '''
+        if self.latin1: return buffer.tobytes().decode("latin-1")[:-1]
+        return self.charsetCodes[buffer].tobytes().decode("utf-32-le")[:-1]
+
+    def __len__(self):
+        return self.frames.shape[0]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.Text(buffer) for buffer in self.frames[index]]
+        return self.Text(self.frames[index])
+
+    def __iter__(self):
+        return (self.Text(buffer) for buffer in self.frames)
+
+    def __repr__(self):
+        return "VideoStore(frames=" + str(len(self)) + ", shape=" + str(self.shape) + ", fps=" + str(self.fps) + ")"
+
+# Main Functions
+def VideoStore_Save(buffers, path, fps=30.0, charset=None, name="Video", batch=True):
+    '''
+    Video Store - Save character buffers (an iterable of frame batches, or of single frames if not batch) to a video store file
+    '''
+    writer = None
+    for buffer in buffers:
+        if writer is None:
+            writer = VideoStoreWriter(path, buffer.shape[-2], buffer.shape[-1]-1, fps, charset, name)
+        writer.Write(buffer, batch)
+    if writer is None: return 0
+    writer.Close()
+    return writer.frameCount
+
+def VideoStore_Load(path):
+    '''
+    Video Store - Load video store file as JSON data with a memory mapped frame sequence
+    '''
+    store = VideoStore(path)
+    return {"name": store.name, "data": store}
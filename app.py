@@ -4,6 +4,7 @@ Stream lit GUI for hosting AnimASCII
 
 # Imports
 import os
+import tempfile
 import streamlit as st
 import json
 import time
@@ -12,9 +13,16 @@ import cv2
 import numpy as np
 
 import AnimASCII
+import AnimFileLibrary
+import ASCIIMapLibrary
+import CacheLibrary
 import Fonts
+import FrameLibrary
 import GeneratorLibrary
 import PaddingLibrary
+import ToneLibrary
+import VideoStoreLibrary
+from Utils import ImageUtils
 from Utils import VideoUtils
 
 # Main Vars
@@ -56,12 +64,20 @@ PATHS = {
         "image": "StreamLitGUI/DefaultData/ExampleImage.png",
         "video": "StreamLitGUI/DefaultData/ExampleVideo.mp4"
     },
-    "image_ascii_maps": "Data/ImageASCIIData/"
+    "image_ascii_maps": "Data/ImageASCIIData/",
+    "temp": {
+        "prefix": "AnimASCII_"
+    }
 }
 
 IMAGE_PROCESS_STYLES = {
-    "Fill-Based": GeneratorLibrary.GenerateASCII_ImageBased_Fill,
-    "Borders-Based": GeneratorLibrary.GenerateASCII_ImageBased_Border
+    "Fill-Based": GeneratorLibrary.RenderASCII_ImageBased_Fill,
+    "Borders-Based": GeneratorLibrary.RenderASCII_ImageBased_Border,
+    "Gradient-Borders-Based": GeneratorLibrary.RenderASCII_ImageBased_BorderGradient,
+    "Glyph-Based": GeneratorLibrary.RenderASCII_ImageBased_Glyph
+}
+IMAGE_PROCESS_CELLSIZES = {
+    "Glyph-Based": GeneratorLibrary.GLYPH_CELL_SIZE
 }
 
 INPUTREADERS_VIDEO = {
@@ -71,27 +87,25 @@ INPUTREADERS_VIDEO = {
 
 ANIMATION_DISPLAYDELAY = 0.1
 VIDEO_DISPLAYDELAY = 0.1
+VIDEO_BATCHSIZE = 64
 
 INDICATOR_IMAGEASCII_IMAGE_SIZE = [256, 256]
 INDICATOR_IMAGEASCII_ASCII_SIZE = [8, 8]
 
+ASCII_CHAR_ASPECT = ImageUtils.CHAR_ASPECT_RATIO
+ASCII_HSTRETCH = 3
+ASCII_HSTRETCH_MODES = ["Resample Columns", "Repeat Characters"]
+ASCII_WIDTH_RANGE = [1, 256, 48]
+
 # Util Vars
 ANIMATION_EXAMPLES = []
-ANIMATION_PLAYLIST = [] # Example element => [window, frames, loopCount, finishStatus]
+ANIMATION_PLAYLIST = [] # Example element => [window, frames (FrameTimeline), loopCount, finishStatus, displayedFrameId]
 IMAGE_ASCII_MAPS = {}
 INDICATOR_IMAGEASCII_IMAGE = None
 INDICATOR_IMAGEASCII_ASCII = None
+RESULT_CACHE = CacheLibrary.ResultCache_Shared()
 
 # Util Functions
-def AddInbetweenSpace(text, spaces=1):
-    '''
-    Adds spaces inbetween characters of text
-    '''
-    textLines = text.split("\n")
-    textSpacedLines = [(" "*spaces).join(list(l)) for l in textLines]
-    textSpaced = "\n".join(textSpacedLines)
-    return textSpaced
-
 def GetNames(data):
     '''
     Gets names from list of dicts with "name" key
@@ -118,6 +132,33 @@ def GenerateIndicatorImage_ImageASCII():
         INDICATOR_IMAGEASCII_IMAGE = cv2.resize(INDICATOR_IMAGEASCII_IMAGE, tuple(INDICATOR_IMAGEASCII_IMAGE_SIZE))
     return INDICATOR_IMAGEASCII_IMAGE
 
+def TempFiles_Create(key, suffixes):
+    '''
+    Temp Files - Create unique temp files (one per suffix) of this session under key, removing earlier files of key
+    '''
+    # All sessions run in one server process, so each session gets its own temp directory and each run its own files
+    # (a file another session still has memory mapped must never be truncated)
+    TempFiles_Remove(key)
+    if "temp_dir" not in st.session_state or not os.path.isdir(st.session_state["temp_dir"]):
+        st.session_state["temp_dir"] = tempfile.mkdtemp(prefix=PATHS["temp"]["prefix"])
+    paths = []
+    for suffix in suffixes:
+        fd, path = tempfile.mkstemp(suffix=suffix, dir=st.session_state["temp_dir"])
+        os.close(fd)
+        paths.append(path)
+    st.session_state["temp_files_" + key] = paths
+    return paths
+
+def TempFiles_Remove(key):
+    '''
+    Temp Files - Remove temp files of this session under key
+    '''
+    for path in st.session_state.pop("temp_files_" + key, []):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
 # Main Functions
 def DisplayASCIIAnimationsCombined():
     '''
@@ -132,7 +173,11 @@ def DisplayASCIIAnimationsCombined():
             frames = anim[1]
             loopCount = anim[2]
             if (i < (len(frames)*loopCount)) or (loopCount == -1):
-                AnimDisplay.markdown("```\n" + frames[i%len(frames)])
+                # Markdown is only pushed when the frame changes
+                frameId = frames.FrameId(i%len(frames))
+                if frameId != anim[4]:
+                    AnimDisplay.markdown("```\n" + frames.frameTable[frameId])
+                    anim[4] = frameId
                 allDone = False
             else:
                 anim[3] = True
@@ -145,7 +190,10 @@ def LoadExampleAnimations():
     '''
     global ANIMATION_EXAMPLES
     for p in os.listdir(PATHS["animations"]["examples"]):
-        anim = json.load(open(os.path.join(PATHS["animations"]["examples"], p), "r"))
+        # Hidden files (like unfinished batch render outputs) are skipped
+        if p.startswith("."): continue
+        if os.path.splitext(p)[-1].lower() not in [".json", ".jsonl", AnimFileLibrary.ANIMFILE_EXT, VideoStoreLibrary.VIDEOSTORE_EXT]: continue
+        anim = AnimASCII.Animation_Load(os.path.join(PATHS["animations"]["examples"], p))
         ANIMATION_EXAMPLES.append(anim)
 
 def LoadImageASCIIMaps():
@@ -155,8 +203,22 @@ def LoadImageASCIIMaps():
     global IMAGE_ASCII_MAPS
     for f in os.listdir(PATHS["image_ascii_maps"]):
         if f.endswith(".json"):
-            image_ascii_map = json.load(open(os.path.join(PATHS["image_ascii_maps"], f), "r"))
-            IMAGE_ASCII_MAPS[image_ascii_map["name"]] = image_ascii_map
+            image_ascii_map = ASCIIMapLibrary.ASCIIMap_Load(os.path.join(PATHS["image_ascii_maps"], f))
+            IMAGE_ASCII_MAPS[image_ascii_map.name] = image_ascii_map
+
+def GetCellAspect(repeatStretch=1):
+    '''
+    Gets aspect ratio (height / width) of the space one image pixel takes in displayed ASCII art
+    '''
+    # Each pixel is displayed as its character repeated repeatStretch times
+    return ASCII_CHAR_ASPECT / repeatStretch
+
+def ResizeImage_ASCIICells(I, asciiWidth, cellSize=(1, 1), stretch=(1, 1)):
+    '''
+    Resizes image to asciiWidth character cells of given pixel size (H, W) per row, stretched by (resample, repeat) factors
+    '''
+    cols = asciiWidth * stretch[0]
+    return ImageUtils.ResizeImage_CellMean(I, cols*cellSize[1], GetCellAspect(stretch[1])*cellSize[1]/cellSize[0])
 
 def GetTextDisplayCode(text, imgWidth, maxPixs=750, scale=0.8, compact=True):
     '''
@@ -177,37 +239,43 @@ def GetTextDisplayCode(text, imgWidth, maxPixs=750, scale=0.8, compact=True):
     return text
 
 # UI Functions
+def UI_CacheStats():
+    '''
+    UI - Display result cache hit and miss counts
+    '''
+    stats = RESULT_CACHE.Stats()
+    st.sidebar.caption(
+        "Cache: " + str(stats["hits"]) + " hits, " + str(stats["misses"]) + " misses, "
+        + str(stats["entries"]) + " entries (" + str(round(stats["bytes"] / 2**20, 1)) + " MB)"
+    )
+
 def UI_RegisterDisplayASCIIAnimation(frames, col=st, loopCount=-1):
     '''
     UI - Register Display ASCII Animation
     '''
     AnimDisplay = col.empty()
-    ANIMATION_PLAYLIST.append([AnimDisplay, frames, loopCount, False])
+    frames = FrameLibrary.Frames_Intern(frames)
+    ANIMATION_PLAYLIST.append([AnimDisplay, frames, loopCount, False, None])
 
 def UI_LoadImage():
     '''
     UI - Load Image
     '''
-    USERINPUT_ImageData = st.file_uploader("Upload Start Image", ["png", "jpg", "jpeg", "bmp"])
+    USERINPUT_ImageData = st.file_uploader("Upload Start Image", ["png", "jpg", "jpeg", "bmp", "tif", "tiff"])
 
     if USERINPUT_ImageData is not None:
         USERINPUT_ImageData = USERINPUT_ImageData.read()
     if USERINPUT_ImageData is None:
         USERINPUT_ImageData = open(PATHS["defaults"]["image"], "rb").read()
 
-    USERINPUT_Image = cv2.imdecode(np.frombuffer(USERINPUT_ImageData, np.uint8), cv2.IMREAD_COLOR)
+    # 16 bit images are kept at full depth and rendered natively
+    USERINPUT_Image = cv2.imdecode(np.frombuffer(USERINPUT_ImageData, np.uint8), cv2.IMREAD_COLOR | cv2.IMREAD_ANYDEPTH)
     USERINPUT_Image = cv2.cvtColor(USERINPUT_Image, cv2.COLOR_BGR2RGB)
-    st.image(USERINPUT_Image, "Input Image")
-
-    USERINPUT_ResizeRatio = st.slider("Resize Ratio", 0.0, 1.0, 0.01, 0.01)
-    USERINPUT_Invert = st.checkbox("Invert Image?")
+    st.image(GeneratorLibrary.Image_To8Bit(USERINPUT_Image), "Input Image")
 
-    ResizedSize = (int(USERINPUT_Image.shape[1] * USERINPUT_ResizeRatio), int(USERINPUT_Image.shape[0] * USERINPUT_ResizeRatio))
-    USERINPUT_Image = cv2.resize(USERINPUT_Image, ResizedSize)
-    if USERINPUT_Invert:
-        USERINPUT_Image = 255 - USERINPUT_Image
+    USERINPUT_ASCIIWidth = st.slider("ASCII Width (Characters)", *ASCII_WIDTH_RANGE, 1)
 
-    return USERINPUT_Image
+    return USERINPUT_Image, USERINPUT_ASCIIWidth
 
 def UI_LoadVideo():
     '''
@@ -233,6 +301,25 @@ def UI_LoadVideo():
 
     return USERINPUT_Video, not FiniteFrames
 
+def UI_HorizontalStretch():
+    '''
+    UI - Horizontal Stretch - (resample, repeat) stretch factors
+    '''
+    # Characters are about twice as tall as wide, so frames are displayed ASCII_HSTRETCH times wider
+    USERINPUT_StretchMode = st.sidebar.selectbox("Horizontal Stretch", ASCII_HSTRETCH_MODES)
+    if USERINPUT_StretchMode == "Resample Columns": return (ASCII_HSTRETCH, 1)
+    return (1, ASCII_HSTRETCH)
+
+def UI_ToneCurve():
+    '''
+    UI - Tone Curve Params
+    '''
+    USERINPUT_Invert = st.checkbox("Invert?")
+    USERINPUT_Gamma = st.slider("Gamma", 0.2, 5.0, 1.0, 0.05)
+    USERINPUT_Contrast = st.selectbox("Contrast", ToneLibrary.TONE_CONTRAST_MODES)
+
+    return {"invert": USERINPUT_Invert, "gamma": USERINPUT_Gamma, "contrast": USERINPUT_Contrast}
+
 def UI_ChooseStyle():
     '''
     UI - Choose Style
@@ -240,11 +327,21 @@ def UI_ChooseStyle():
     global INDICATOR_IMAGEASCII_IMAGE
 
     USERINPUT_StyleChoice = st.selectbox("Select Style", ["Select Style"] + list(IMAGE_PROCESS_STYLES.keys()))
-    if USERINPUT_StyleChoice == "Select Style": return None
+    if USERINPUT_StyleChoice == "Select Style": return None, None
     USERINPUT_ProcessStyle = IMAGE_PROCESS_STYLES[USERINPUT_StyleChoice]
-    if USERINPUT_StyleChoice == "Borders-Based":
+    USERINPUT_CellSize = IMAGE_PROCESS_CELLSIZES.get(USERINPUT_StyleChoice, (1, 1))
+    if USERINPUT_StyleChoice == "Fill-Based":
+        USERINPUT_Dither = st.selectbox("Dithering", ["None"] + GeneratorLibrary.DITHER_MODES)
+        if USERINPUT_Dither != "None":
+            USERINPUT_ProcessStyle = functools.partial(USERINPUT_ProcessStyle, dither=USERINPUT_Dither)
+    elif USERINPUT_StyleChoice == "Borders-Based":
         USERINPUT_BorderThresholds = st.slider("Border Thresholds", 0, 255, (30, 200), 1)
         USERINPUT_ProcessStyle = functools.partial(USERINPUT_ProcessStyle, thresholds=USERINPUT_BorderThresholds)
+    elif USERINPUT_StyleChoice == "Gradient-Borders-Based":
+        USERINPUT_GradientThreshold = st.slider("Gradient Threshold", 0, 1024, 100, 1)
+        USERINPUT_DirectionChars = st.text_input("Direction Characters", "|/-\\")
+        if len(USERINPUT_DirectionChars) == 0: USERINPUT_DirectionChars = "|/-\\"
+        USERINPUT_ProcessStyle = functools.partial(USERINPUT_ProcessStyle, threshold=USERINPUT_GradientThreshold, directionChars=USERINPUT_DirectionChars)
 
     USERINPUT_ImageASCIIMapChoice = st.sidebar.selectbox("Select Image ASCII Map", list(IMAGE_ASCII_MAPS.keys()))
     USERINPUT_ImageASCIIMap = IMAGE_ASCII_MAPS[USERINPUT_ImageASCIIMapChoice]
@@ -252,16 +349,16 @@ def UI_ChooseStyle():
     col1, col2 = st.sidebar.columns(2)
     GenerateIndicatorImage_ImageASCII()
     col1.image(INDICATOR_IMAGEASCII_IMAGE, caption="Indicator Image", use_container_width=True)
-    IndicatorImageResized = cv2.resize(INDICATOR_IMAGEASCII_IMAGE, tuple(INDICATOR_IMAGEASCII_ASCII_SIZE))
+    IndicatorImageResized = cv2.resize(INDICATOR_IMAGEASCII_IMAGE, (INDICATOR_IMAGEASCII_ASCII_SIZE[0]*ASCII_HSTRETCH, INDICATOR_IMAGEASCII_ASCII_SIZE[1]))
     IndicatorStyle = functools.partial(IMAGE_PROCESS_STYLES["Fill-Based"], IMAGE_FILL_ASCII=USERINPUT_ImageASCIIMap)
-    INDICATOR_IMAGEASCII_ASCII, finalImg = AnimASCII.Convert_Image2ASCIIArt(IndicatorImageResized, IndicatorStyle)
-    INDICATOR_IMAGEASCII_ASCII = AddInbetweenSpace(INDICATOR_IMAGEASCII_ASCII, spaces=2)
+    INDICATOR_IMAGEASCII_ASCII, finalImg = AnimASCII.Convert_Image2ASCIIBuffer(IndicatorImageResized, IndicatorStyle)
+    INDICATOR_IMAGEASCII_ASCII = GeneratorLibrary.ASCIIBuffer_ToStr(INDICATOR_IMAGEASCII_ASCII)
     INDICATOR_IMAGEASCII_ASCII = GetTextDisplayCode(INDICATOR_IMAGEASCII_ASCII, GetASCIIWidth(INDICATOR_IMAGEASCII_ASCII), scale=0.25, compact=False)
     col2.markdown(INDICATOR_IMAGEASCII_ASCII, unsafe_allow_html=True)
 
     USERINPUT_ProcessStyle = functools.partial(USERINPUT_ProcessStyle, IMAGE_FILL_ASCII=USERINPUT_ImageASCIIMap)
 
-    return USERINPUT_ProcessStyle
+    return USERINPUT_ProcessStyle, USERINPUT_CellSize
 
 # Repo Based Functions
 def example_animations():
@@ -298,7 +395,8 @@ def text_to_ascii():
     USERINPUT_CompactDisplay = st.sidebar.checkbox("Compact Display", True)
 
     # Process Inputs
-    GenASCIIArt = AnimASCII.Convert_Text2ASCIIArt(USERINPUT_Text, USERINPUT_FontChoice)
+    GenASCIIArt = AnimASCII.Convert_Text2ASCIIArt(USERINPUT_Text, USERINPUT_FontChoice, cache=RESULT_CACHE)
+    UI_CacheStats()
 
     # Display Output
     asciiWidth = GetASCIIWidth(GenASCIIArt)
@@ -314,23 +412,33 @@ def image_to_ascii():
     LoadImageASCIIMaps()
 
     # Load Inputs
-    USERINPUT_Image = UI_LoadImage()
+    USERINPUT_Image, USERINPUT_ASCIIWidth = UI_LoadImage()
+    USERINPUT_ToneParams = UI_ToneCurve()
+    USERINPUT_Stretch = UI_HorizontalStretch()
 
-    USERINPUT_ProcessStyle = UI_ChooseStyle()
+    USERINPUT_ProcessStyle, USERINPUT_CellSize = UI_ChooseStyle()
     if USERINPUT_ProcessStyle is None: return
 
     # Process Inputs
-    GenASCIIArt, I_final = AnimASCII.Convert_Image2ASCIIArt(USERINPUT_Image, USERINPUT_ProcessStyle)
-    GenASCIIArt_Padded = PaddingLibrary.Padding_FramePad([GenASCIIArt])[0]
-    GenASCIIArt_Padded = AddInbetweenSpace(GenASCIIArt_Padded, spaces=2)
+    USERINPUT_Image = ResizeImage_ASCIICells(USERINPUT_Image, USERINPUT_ASCIIWidth, USERINPUT_CellSize, USERINPUT_Stretch)
+    ToneCurve = ToneLibrary.ToneCurve_FromImage(USERINPUT_Image, **USERINPUT_ToneParams)
+    USERINPUT_ProcessStyle = functools.partial(USERINPUT_ProcessStyle, toneCurve=ToneCurve)
+    def ConvertImage():
+        GenASCIIBuffer, I_final = AnimASCII.Convert_Image2ASCIIBuffer(USERINPUT_Image, USERINPUT_ProcessStyle, hStretch=USERINPUT_Stretch[1])
+        return GeneratorLibrary.ASCIIBuffer_ToStr(PaddingLibrary.Padding_FramePad_Buffer(GenASCIIBuffer)), I_final
+    # Reruns with the same image and settings reuse the cached result
+    GenASCIIArt_Padded, I_final = RESULT_CACHE.Call(
+        ("image_to_ascii", USERINPUT_Image, USERINPUT_ProcessStyle, USERINPUT_Stretch[1]), ConvertImage
+    )
+    UI_CacheStats()
     USERINPUT_CompactDisplay = st.sidebar.checkbox("Compact Display", True)
 
     # Display Output
     st.markdown("## Display ASCII Art")
 
     col1, col2 = st.columns(2)
-    col1.image(USERINPUT_Image, caption="Original Image", use_container_width=True)
-    col2.image(I_final, caption="Final Image", use_container_width=True)
+    col1.image(GeneratorLibrary.Image_To8Bit(USERINPUT_Image), caption="Original Image", use_container_width=True)
+    col2.image(GeneratorLibrary.Image_To8Bit(I_final), caption="Final Image", use_container_width=True)
 
     asciiWidth = GetASCIIWidth(GenASCIIArt_Padded)
     GenASCIIArt_Padded = GetTextDisplayCode(GenASCIIArt_Padded, asciiWidth, compact=USERINPUT_CompactDisplay)
@@ -345,11 +453,13 @@ def video_to_ascii_animation():
     # Load Inputs
     USERINPUT_Video, WebcamVid = UI_LoadVideo()
 
-    USERINPUT_ProcessStyle = UI_ChooseStyle()
+    USERINPUT_ProcessStyle, USERINPUT_CellSize = UI_ChooseStyle()
     if USERINPUT_ProcessStyle is None: return
 
-    USERINPUT_Invert = st.checkbox("Invert Video Frames?")
-    USERINPUT_ResizeRatio = st.slider("Resize Ratio", 0.0, 1.0, 0.01, 0.01)
+    USERINPUT_ToneParams = UI_ToneCurve()
+    ToneMapper = ToneLibrary.ToneMapper(**USERINPUT_ToneParams)
+    USERINPUT_Stretch = UI_HorizontalStretch()
+    USERINPUT_ASCIIWidth = st.slider("ASCII Width (Characters)", *ASCII_WIDTH_RANGE, 1)
     USERINPUT_CompactDisplay = st.sidebar.checkbox("Compact Display", True)
 
     st.markdown("## Display ASCII Animation")
@@ -363,43 +473,69 @@ def video_to_ascii_animation():
 
     if not WebcamVid:
         USERINPUT_Frames = VideoUtils.GetFramesFromVideo(USERINPUT_Video, max_frames=-1)
-
-        GenASCIIAnim = []
-        Frames_Processed = []
-        i=0
-        for frame in USERINPUT_Frames:
-            ResizedSize = (int(frame.shape[1] * USERINPUT_ResizeRatio), int(frame.shape[0] * USERINPUT_ResizeRatio))
-            frame = cv2.resize(frame, ResizedSize)
-            if USERINPUT_Invert:
-                frame = 255 - frame
-            GenASCIIArt, frame_final = AnimASCII.Convert_Image2ASCIIArt(frame, USERINPUT_ProcessStyle)
-            GenASCIIArt_Padded = PaddingLibrary.Padding_FramePad([GenASCIIArt])[0]
-            GenASCIIArt_Padded = AddInbetweenSpace(GenASCIIArt_Padded, spaces=2)
-            GenASCIIAnim.append(GenASCIIArt_Padded)
-            Frames_Processed.append(frame_final)
-            i+=1
-            LoaderWidget.markdown("[" + str(i) + " / " + str(len(USERINPUT_Frames)) + "]" + ": Frames Processed")
-        LoaderWidget.markdown("All Frames Processed :smiley:!")
-
-        asciiWidth = GetASCIIWidth(GenASCIIAnim[0])
-
         frameMaxCount = len(USERINPUT_Frames)
-        frameIndex = 0
-        while True:
-            frame = cv2.cvtColor(USERINPUT_Frames[frameIndex], cv2.COLOR_BGR2RGB)
-            frame_processed = Frames_Processed[frameIndex]
-            GenASCIIArt_Padded = GenASCIIAnim[frameIndex]
-            GenASCIIArt_Padded = GetTextDisplayCode(GenASCIIArt_Padded, asciiWidth, compact=USERINPUT_CompactDisplay)
-            AnimWidget_Frame.image(frame, caption="Original", use_container_width=True)
-            AnimWidget_FinalImage.image(frame_processed, caption="Final", use_container_width=True)
-            AnimWidget_ASCII.markdown("\n"
-             + GenASCIIArt_Padded
-            , unsafe_allow_html=True)
-            frameIndex = (frameIndex + 1) % frameMaxCount
-            time.sleep(VIDEO_DISPLAYDELAY)
+
+        # ASCII frames and final images are written to memory mapped files and paged in on demand while playing
+        # Files are unique to this run and removed when it stops (a rerun stops the running script)
+        videoASCIIPath, videoFinalPath = TempFiles_Create("video", [VideoStoreLibrary.VIDEOSTORE_EXT, ".npy"])
+        try:
+            GenASCIIStore = None
+            Frames_Processed = None
+            GenASCIIBuffer = None
+            for i in range(0, len(USERINPUT_Frames), VIDEO_BATCHSIZE):
+                # Convert a batch of frames in one call
+                frames = []
+                for frame in USERINPUT_Frames[i:i+VIDEO_BATCHSIZE]:
+                    frames.append(ResizeImage_ASCIICells(frame, USERINPUT_ASCIIWidth, USERINPUT_CellSize, USERINPUT_Stretch))
+                frames = np.stack(frames)
+                BatchStyle = functools.partial(USERINPUT_ProcessStyle, toneCurve=ToneMapper.Update(frames, batch=True))
+                BatchBuffer = None if GenASCIIBuffer is None else GenASCIIBuffer[:frames.shape[0]]
+                BatchBuffer, frames_final = AnimASCII.Convert_Image2ASCIIBuffer(frames, BatchStyle, BatchBuffer, batch=True, hStretch=USERINPUT_Stretch[1])
+                if GenASCIIBuffer is None: GenASCIIBuffer = BatchBuffer
+                PaddedBuffer = PaddingLibrary.Padding_FramePad_Buffer(BatchBuffer, batch=True)
+                if GenASCIIStore is None:
+                    GenASCIIStore = VideoStoreLibrary.VideoStoreWriter(
+                        videoASCIIPath, PaddedBuffer.shape[-2], PaddedBuffer.shape[-1]-1,
+                        fps=1.0/VIDEO_DISPLAYDELAY
+                    )
+                    Frames_Processed = np.lib.format.open_memmap(
+                        videoFinalPath, mode="w+",
+                        dtype=frames_final.dtype, shape=(frameMaxCount,) + frames_final.shape[1:]
+                    )
+                GenASCIIStore.Write(PaddedBuffer, batch=True)
+                Frames_Processed[i:i+frames_final.shape[0]] = frames_final
+                LoaderWidget.markdown("[" + str(GenASCIIStore.frameCount) + " / " + str(frameMaxCount) + "]" + ": Frames Processed")
+            GenASCIIStore.Close()
+            Frames_Processed.flush()
+            GenASCIIAnim = VideoStoreLibrary.VideoStore(videoASCIIPath)
+            LoaderWidget.markdown("All Frames Processed :smiley:!")
+
+            asciiWidth = GetASCIIWidth(GenASCIIAnim[0])
+
+            frameIndex = 0
+            displayedBuffer = None
+            while True:
+                frame = cv2.cvtColor(USERINPUT_Frames[frameIndex], cv2.COLOR_BGR2RGB)
+                frame_processed = Frames_Processed[frameIndex]
+                AnimWidget_Frame.image(frame, caption="Original", use_container_width=True)
+                AnimWidget_FinalImage.image(frame_processed, caption="Final", use_container_width=True)
+                # Static scenes give repeated ascii frames, which are only displayed once
+                frameBuffer = GenASCIIAnim.Buffer(frameIndex)
+                if displayedBuffer is None or not np.array_equal(frameBuffer, displayedBuffer):
+                    GenASCIIArt_Padded = GetTextDisplayCode(GenASCIIAnim.Text(frameBuffer), asciiWidth, compact=USERINPUT_CompactDisplay)
+                    AnimWidget_ASCII.markdown("\n"
+                     + GenASCIIArt_Padded
+                    , unsafe_allow_html=True)
+                    displayedBuffer = frameBuffer
+                frameIndex = (frameIndex + 1) % frameMaxCount
+                time.sleep(VIDEO_DISPLAYDELAY)
+        finally:
+            if GenASCIIStore is not None: GenASCIIStore.Close()
+            TempFiles_Remove("video")
 
     else:
         sizeFixed = False
+        GenASCIIBuffer = None
         
         max_frames = -1
         frameCount = 0
@@ -407,15 +543,12 @@ def video_to_ascii_animation():
             # Capture frame-by-frame
             ret, frame = USERINPUT_Video.read()
             if ret:
-                ResizedSize = (int(frame.shape[1] * USERINPUT_ResizeRatio), int(frame.shape[0] * USERINPUT_ResizeRatio))
-                frame = cv2.cvtColor(frame_processed, cv2.COLOR_BGR2RGB)
-                frame_processed = cv2.resize(frame, ResizedSize)
-                if USERINPUT_Invert:
-                    frame_processed = 255 - frame_processed
-
-                GenASCIIArt, frame_processed = AnimASCII.Convert_Image2ASCIIArt(frame_processed, USERINPUT_ProcessStyle)
-                GenASCIIArt_Padded = PaddingLibrary.Padding_FramePad([GenASCIIArt])[0]
-                GenASCIIArt_Padded = AddInbetweenSpace(GenASCIIArt_Padded, spaces=2)
+                frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+                frame_processed = ResizeImage_ASCIICells(frame, USERINPUT_ASCIIWidth, USERINPUT_CellSize, USERINPUT_Stretch)
+                FrameStyle = functools.partial(USERINPUT_ProcessStyle, toneCurve=ToneMapper.Update(frame_processed))
+
+                GenASCIIBuffer, frame_processed = AnimASCII.Convert_Image2ASCIIBuffer(frame_processed, FrameStyle, GenASCIIBuffer, hStretch=USERINPUT_Stretch[1])
+                GenASCIIArt_Padded = GeneratorLibrary.ASCIIBuffer_ToStr(PaddingLibrary.Padding_FramePad_Buffer(GenASCIIBuffer))
                 frameCount += 1
 
                 if not sizeFixed:
@@ -0,0 +1,29 @@
+"""
+Tests for cell mean resizing in ImageUtils
+"""
+
+# Imports
+import os
+import sys
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Utils import ImageUtils
+
+# Main Functions
+def test_ResizeImage_CellMean_SignedUnevenCells():
+    # 3x3 image into 2x2 cells gives uneven cells of 1 and 2 pixels per side
+    I = np.full((3, 3), -100, dtype=np.int16)
+    I_cells = ImageUtils.ResizeImage_CellMean(I, 2, 1.0)
+    assert I_cells.dtype == np.int16
+    assert np.array_equal(I_cells, np.full((2, 2), -100, dtype=np.int16))
+
+def test_ResizeImage_CellEdges_SignedMeans():
+    I = np.array([[-3, -1, 5], [-5, 1, 7], [2, 2, 2]], dtype=np.int16)
+    I_cells = ImageUtils.ResizeImage_CellEdges(I, [0, 2, 3], [0, 2, 3])
+    assert np.array_equal(I_cells, np.array([[-2, 6], [2, 2]], dtype=np.int16))
+
+def test_CellSum_Dtype():
+    assert ImageUtils.CellSum_Dtype(np.int16, 4) == np.int64
+    assert ImageUtils.CellSum_Dtype(np.uint8, 4) == np.uint32
+    assert ImageUtils.CellSum_Dtype(np.float32, 4) == np.float64